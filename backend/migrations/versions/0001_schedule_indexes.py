@@ -0,0 +1,41 @@
+"""Composite indexes for schedule and program lookups
+
+Tables themselves are created by server_mysql.py on startup (create_all),
+which on a fresh database already includes these indexes, so each index is
+only created when missing.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    # now-playing, conflict checks and per-channel listings by time
+    ("ix_schedule_items_channel_start", "schedule_items", ["channel_id", "start_time"]),
+    # now-playing / next-up filtered by status
+    ("ix_schedule_items_channel_status_start", "schedule_items", ["channel_id", "status", "start_time"]),
+    # program listings per channel, newest first
+    ("ix_programs_channel_created", "programs", ["channel_id", "created_at"]),
+]
+
+
+def existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        if op.get_context().as_sql or name not in existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,38 @@
+"""Index for the EPG's cross-channel window query
+
+GET /api/epg loads every item overlapping an hour bucket
+(end_time > from AND start_time < to) across channels, which none of the
+channel-leading indexes from 0001 can serve. As in 0001, create_all already
+adds it on a fresh database, so it is only created when missing.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    # EPG hour buckets: items ending after the bucket starts, any channel
+    ("ix_schedule_items_end_start", "schedule_items", ["end_time", "start_time"]),
+]
+
+
+def existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        if op.get_context().as_sql or name not in existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -1,5 +1,6 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Query, Body, status, UploadFile, File, Request
+from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -13,24 +14,48 @@ from datetime import datetime, timezone, timedelta
 from passlib.context import CryptContext
 import jwt
 import asyncio
+import feedparser
+import requests
 import json
+import base64
+import hashlib
+import orjson
+import numpy as np
+import bisect
+import heapq
+import random
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import time
+from collections import deque
 from collections.abc import AsyncGenerator
+from contextlib import AsyncExitStack
+from types import SimpleNamespace
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection. Datetimes are stored as native BSON dates (UTC) and read
+# back timezone-aware; run scripts/convert_mongo_datetimes.py once on databases
+# written by older versions that stored ISO strings.
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[os.environ['DB_NAME']]
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt takes ~250 ms of CPU per call and releases the GIL, so it runs on a
+# small dedicated thread pool; beyond the queue limit logins are shed with 503
+PASSWORD_POOL_SIZE = int(os.environ.get('PASSWORD_POOL_SIZE', '2'))
+PASSWORD_QUEUE_LIMIT = int(os.environ.get('PASSWORD_QUEUE_LIMIT', '32'))
 
 # JWT settings
 SECRET_KEY = os.environ.get('JWT_SECRET', 'nzuritv-secret-key-change-in-production')
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
+USER_ROLES = ("admin", "editor", "viewer")
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL_SECONDS = 60
 
 # Create the main app
 app = FastAPI()
@@ -43,14 +68,14 @@ class User(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
     email: EmailStr
-    role: str = "editor"  # admin or editor
+    role: str = "viewer"  # admin, editor or viewer
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class UserCreate(BaseModel):
     name: str
     email: EmailStr
     password: str
-    role: str = "editor"
+    role: Optional[str] = None  # honoured only when an admin registers the account
 
 class UserLogin(BaseModel):
     email: EmailStr
@@ -61,6 +86,14 @@ class Token(BaseModel):
     token_type: str
     user: User
 
+class TokenClaims(BaseModel):
+    id: str
+    name: str
+    email: str
+    role: str
+    jti: str
+    exp: int
+
 class Channel(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -99,6 +132,10 @@ class ProgramCreate(BaseModel):
     youtube_link: Optional[str] = None
     duration_seconds: Optional[int] = None
 
+class ProgramBulkDelete(BaseModel):
+    ids: Optional[List[str]] = None
+    channel_id: Optional[str] = None
+
 class ScheduleItem(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -108,6 +145,7 @@ class ScheduleItem(BaseModel):
     end_time: datetime
     is_live: bool = False
     status: str = "scheduled"  # scheduled, running, completed, cancelled
+    rule_id: Optional[str] = None  # set on occurrences expanded from a ScheduleRule
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -123,6 +161,125 @@ class ScheduleItemUpdate(BaseModel):
     end_time: Optional[datetime] = None
     status: Optional[str] = None
 
+class ScheduleBulkCreate(BaseModel):
+    items: List[ScheduleItemCreate]
+    all_or_nothing: bool = False
+
+class ScheduleBulkResult(BaseModel):
+    index: int
+    status: str  # created, conflict, invalid, skipped
+    id: Optional[str] = None
+    detail: Optional[str] = None
+
+class ScheduleBulkResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[ScheduleBulkResult]
+
+class ScheduleValidateItem(BaseModel):
+    id: Optional[str] = None  # set when moving a stored item; it never conflicts with itself
+    channel_id: str
+    start_time: datetime
+    end_time: datetime
+
+class ScheduleValidateRequest(BaseModel):
+    items: List[ScheduleValidateItem]
+
+class ScheduleConflict(BaseModel):
+    id: str
+    program_id: Optional[str] = None
+    start_time: datetime
+    end_time: datetime
+
+class ScheduleValidateResult(BaseModel):
+    index: int
+    status: str  # ok, conflict, invalid
+    conflicts: List[ScheduleConflict] = []  # stored items
+    batch_conflicts: List[int] = []  # indexes of other items of this request
+    detail: Optional[str] = None
+
+class ScheduleValidateResponse(BaseModel):
+    valid: bool
+    results: List[ScheduleValidateResult]
+
+class CoverageInterval(BaseModel):
+    start_time: datetime
+    end_time: datetime
+    duration_seconds: float
+
+class CoverageOverlap(CoverageInterval):
+    item_ids: List[str]  # the later item and the earlier one still on air
+
+class ProgramAirtime(BaseModel):
+    program_id: str
+    title: Optional[str] = None
+    slots: int
+    airtime_seconds: float
+
+class ScheduleCoverage(BaseModel):
+    channel_id: str
+    start_time: datetime
+    end_time: datetime
+    items: int
+    filled_seconds: float
+    gap_seconds: float
+    overlap_seconds: float
+    fill_ratio: float
+    gaps: List[CoverageInterval]
+    overlaps: List[CoverageOverlap]
+    programs: List[ProgramAirtime]
+
+class AutofillPoolEntry(BaseModel):
+    program_id: Optional[str] = None
+    tag: Optional[str] = None  # every channel program listing this tag; the weight is split among them
+    weight: float = Field(1.0, gt=0)  # relative share of airtime
+
+class ScheduleAutofillRequest(BaseModel):
+    channel_id: str
+    start_time: datetime
+    end_time: datetime
+    pool: List[AutofillPoolEntry] = []  # empty: every channel program with a duration, equal weights
+    granularity_seconds: Optional[int] = Field(None, ge=1)  # default AUTOFILL_GRANULARITY_SECONDS
+    dry_run: bool = False
+
+class ScheduleAutofillResponse(BaseModel):
+    created: int
+    dry_run: bool
+    filled_seconds: float
+    unfilled: List[CoverageInterval]  # gaps or gap tails no combination of durations fits
+    items: List[ScheduleItem]
+
+class RuleSlot(BaseModel):
+    start: str  # HH:MM, UTC
+    duration_minutes: int
+    program_id: str
+
+class ScheduleRule(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    channel_id: str
+    kind: str  # daily (fixed slots every day) or rotation (round-robin over program_ids)
+    slots: List[RuleSlot] = []
+    program_ids: List[str] = []
+    slot_minutes: Optional[int] = None
+    valid_from: datetime
+    valid_until: Optional[datetime] = None
+    is_live: bool = False
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class ScheduleRuleCreate(BaseModel):
+    channel_id: str
+    kind: str
+    slots: List[RuleSlot] = []
+    program_ids: List[str] = []
+    slot_minutes: Optional[int] = None
+    valid_from: datetime
+    valid_until: Optional[datetime] = None
+    is_live: bool = False
+
+class RuleMaterialize(BaseModel):
+    start_time: datetime
+
 class Ticker(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -158,42 +315,386 @@ class NowPlaying(BaseModel):
     next_program: Optional[Program] = None
     next_start_time: Optional[datetime] = None
 
-# ============ AUTH HELPERS ============
+class EpgItem(BaseModel):
+    id: str
+    program_id: str
+    title: Optional[str] = None
+    duration_seconds: Optional[int] = None  # the program's
+    start_time: datetime
+    end_time: datetime
+    is_live: bool = False
+    rule_id: Optional[str] = None
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+class EpgGrid(BaseModel):
+    start_time: datetime
+    end_time: datetime
+    channels: dict  # channel id -> List[EpgItem], by start_time
+
+# ============ STORAGE HELPERS ============
+
+def as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC so they compare with aware ones"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+class FastJSONResponse(JSONResponse):
+    """orjson-encoded response for rows already shaped by shape_rows.
+
+    Returning it from a route skips FastAPI's response_model validation, so
+    list routes validate each row once (here, on the way out of storage)
+    instead of twice. response_model is still declared for the OpenAPI schema.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+ROW_SHAPES: dict = {}
+MISSING = object()
+
+def row_shape(model) -> list:
+    """(name, default factory or None, is datetime) per model field, built once per model"""
+    shape = ROW_SHAPES.get(model)
+    if shape is None:
+        shape = []
+        for name, field in model.model_fields.items():
+            if field.default_factory is not None:
+                default = field.default_factory
+            elif field.is_required():
+                default = None
+            else:
+                default = (lambda value: lambda: value)(field.default)
+            shape.append((name, default, datetime in (field.annotation, *getattr(field.annotation, '__args__', ()))))
+        ROW_SHAPES[model] = shape
+    return shape
+
+def shape_row(shape: list, doc: dict) -> dict:
+    row = {}
+    for name, default, is_datetime in shape:
+        value = doc.get(name, MISSING)
+        if value is MISSING:
+            if default is None:
+                continue
+            value = default()
+        elif is_datetime and value is not None:
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            value = as_utc(value)
+        row[name] = value
+    return row
+
+def shape_rows(model, docs: list, include: Optional[set] = None) -> list:
+    """Stored docs as response rows: model field order, defaults filled, extras
+    dropped, datetimes aware UTC. The one place list output is coerced."""
+    shape = row_shape(model)
+    if include is not None:
+        shape = [field for field in shape if field[0] in include]
+    return [shape_row(shape, doc) for doc in docs]
+
+# ============ PAGINATION ============
+
+# Largest page for list endpoints; also the default so unpaged clients keep working
+PAGE_SIZE_MAX = 1000
+
+def encode_cursor(sort_value: datetime, item_id: str) -> str:
+    """Opaque keyset cursor for the last row of a page"""
+    raw = json.dumps([as_utc(sort_value).isoformat(), item_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        sort_value, item_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return as_utc(datetime.fromisoformat(sort_value)), item_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def parse_fields(fields: Optional[str], model) -> Optional[set]:
+    """Validate a comma separated fields= projection; id is always included"""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested | {"id"}
+
+def page_response(docs: list, limit: int, sort_field: str, model, include: Optional[set],
+                  headers: dict) -> FastJSONResponse:
+    """Cut docs fetched with limit + 1 to a page, set X-Next-Cursor and apply the projection"""
+    page = docs[:limit]
+    headers = dict(headers)
+    if len(docs) > limit:
+        headers["X-Next-Cursor"] = encode_cursor(page[-1][sort_field], page[-1]["id"])
+    return FastJSONResponse(shape_rows(model, page, include), headers=headers)
+
+def keyset_filter(sort_field: str, cursor: str) -> dict:
+    after_value, after_id = decode_cursor(cursor)
+    return {"$or": [{sort_field: {"$gt": after_value}}, {sort_field: after_value, "id": {"$gt": after_id}}]}
+
+# ============ HTTP CACHING ============
+
+# Version counters only see writes made through this process, so validators
+# also roll over at least this often; writes from other workers or scripts
+# are then visible to revalidating clients within this many seconds. It also
+# bounds how stale time-derived fields (rule occurrence status) can get.
+CACHE_VALIDATOR_MAX_AGE_SECONDS = float(os.environ.get('CACHE_VALIDATOR_MAX_AGE_SECONDS', '30'))
+# For anonymous (viewer) reads: browsers revalidate every time, shared caches
+# (CDN, reverse proxy) may serve for 10s and keep serving while revalidating
+PUBLIC_CACHE_CONTROL = os.environ.get(
+    'PUBLIC_CACHE_CONTROL', "public, max-age=0, s-maxage=10, stale-while-revalidate=30"
+)
+# Authenticated (admin) reads must see their own writes immediately
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+class CollectionVersions:
+    """Per-collection write counters behind the ETags of the list routes"""
+
+    def __init__(self):
+        # Distinguishes this process's counters from another worker's or a restart's
+        self.epoch = uuid.uuid4().hex[:8]
+        self.versions: dict = {}
+
+    def bump(self, *collections: str):
+        for name in collections:
+            self.versions[name] = self.versions.get(name, 0) + 1
+
+    def etag(self, collections: tuple, query: str) -> str:
+        bucket = int(time.time() // CACHE_VALIDATOR_MAX_AGE_SECONDS)
+        versions = ",".join(f"{name}={self.versions.get(name, 0)}" for name in collections)
+        key = f"{self.epoch}|{versions}|{bucket}|{query}"
+        return '"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+
+collection_versions = CollectionVersions()
+
+def cache_validators(*collections: str):
+    """Dependency for read routes: the ETag/Cache-Control headers to send, or a
+    304 raised before the handler runs when If-None-Match already matches"""
+    async def dependency(request: Request) -> dict:
+        # JSON and NDJSON bodies of the same query must not share a validator
+        media_type = NDJSON_MEDIA_TYPE if wants_ndjson(request.headers.get("accept")) else "application/json"
+        etag = collection_versions.etag(collections, f"{media_type}|{request.url.query}")
+        private = request.headers.get("authorization")
+        headers = {
+            "ETag": etag,
+            "Cache-Control": PRIVATE_CACHE_CONTROL if private else PUBLIC_CACHE_CONTROL,
+            "Vary": "Accept, Authorization"
+        }
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if "*" in tags or etag in tags:
+                raise HTTPException(status_code=304, headers=headers)
+        return headers
+    return dependency
+
+# ============ NDJSON EXPORT ============
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Rows per cursor batch and per flushed chunk of an export
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '500'))
+
+def wants_ndjson(accept: Optional[str]) -> bool:
+    return bool(accept) and NDJSON_MEDIA_TYPE in accept
+
+async def ndjson_merge(cursor, extra: list, model, include: Optional[set]):
+    """Encode a sorted Motor cursor merged with a sorted list of extra docs, flushing in chunks"""
+    shape = row_shape(model)
+    if include is not None:
+        shape = [field for field in shape if field[0] in include]
+
+    def ndjson_row(doc: dict) -> bytes:
+        return orjson.dumps(shape_row(shape, doc), option=orjson.OPT_UTC_Z) + b"\n"
+
+    chunk = bytearray()
+    rows = 0
+    position = 0
+    async for doc in cursor:
+        key = (as_utc(doc['start_time']), doc['id'])
+        while position < len(extra) and (extra[position]['start_time'], extra[position]['id']) < key:
+            chunk += ndjson_row(extra[position])
+            position += 1
+            rows += 1
+        chunk += ndjson_row(doc)
+        rows += 1
+        if rows >= EXPORT_BATCH_SIZE:
+            yield bytes(chunk)
+            chunk.clear()
+            rows = 0
+    for doc in extra[position:]:
+        chunk += ndjson_row(doc)
+    if chunk:
+        yield bytes(chunk)
+
+# ============ AUTH HELPERS ============
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+class PasswordHasher:
+    """Runs bcrypt off the event loop on a bounded pool and records latency"""
+
+    def __init__(self, workers: int = PASSWORD_POOL_SIZE, queue_limit: int = PASSWORD_QUEUE_LIMIT):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.shed = 0
+        self.latencies = {"hash": deque(maxlen=1024), "verify": deque(maxlen=1024)}
+
+    async def run(self, op: str, fn, *args):
+        if self.in_flight >= self.queue_limit:
+            self.shed += 1
+            raise HTTPException(status_code=503, detail="Too many concurrent logins, retry shortly",
+                                headers={"Retry-After": "1"})
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.latencies[op].append(time.perf_counter() - started)
+
+    async def hash(self, password: str) -> str:
+        return await self.run("hash", pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run("verify", pwd_context.verify, plain_password, hashed_password)
+
+    def metrics(self) -> dict:
+        def summary(samples):
+            ordered = sorted(samples)
+            if not ordered:
+                return {"count": 0}
+            return {
+                "count": len(ordered),
+                "p50_ms": ordered[len(ordered) // 2] * 1000,
+                "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+                "max_ms": ordered[-1] * 1000
+            }
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "saturation": min(self.in_flight / self.workers, 1.0),
+            "shed": self.shed,
+            "hash": summary(self.latencies["hash"]),
+            "verify": summary(self.latencies["verify"])
+        }
 
-def create_access_token(data: dict):
-    to_encode = data.copy()
+password_hasher = PasswordHasher()
+
+def create_access_token(user: User) -> str:
+    """Sign a token carrying everything route guards need, so they never hit the DB"""
+    to_encode = {
+        "sub": user.id,
+        "name": user.name,
+        "email": user.email,
+        "role": user.role,
+        "jti": uuid.uuid4().hex
+    }
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str) -> User:
+class TokenRevocations:
+    """Revoked token ids, kept until the token would have expired anyway"""
+
+    def __init__(self):
+        self.revoked: dict = {}
+
+    def revoke(self, jti: str, exp: int):
+        now = time.time()
+        self.revoked = {k: v for k, v in self.revoked.items() if v > now}
+        self.revoked[jti] = exp
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self.revoked
+
+class UserCache:
+    """LRU + TTL cache of User records for routes that need more than the token claims"""
+
+    def __init__(self, maxsize: int = USER_CACHE_SIZE, ttl: float = USER_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: OrderedDict = OrderedDict()
+
+    def get(self, user_id: str) -> Optional[User]:
+        entry = self.entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            del self.entries[user_id]
+            return None
+        self.entries.move_to_end(user_id)
+        return user
+
+    def put(self, user: User):
+        self.entries[user.id] = (time.monotonic() + self.ttl, user)
+        self.entries.move_to_end(user.id)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        self.entries.pop(user_id, None)
+
+token_revocations = TokenRevocations()
+user_cache = UserCache()
+bearer_scheme = HTTPBearer(auto_error=False)
+
+async def get_token_claims(credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)) -> TokenClaims:
+    """Verify the bearer token locally: signature, expiry and revocation"""
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        user_doc = await db.users.find_one({"id": user_id}, {"_id": 0})
-        if user_doc is None:
-            raise HTTPException(status_code=401, detail="User not found")
-        if isinstance(user_doc.get('created_at'), str):
-            user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
-        return User(**user_doc)
+        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        claims = TokenClaims(id=payload["sub"], **{k: payload[k] for k in ("name", "email", "role", "jti", "exp")})
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
-    except Exception as e:
+    except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
+    if token_revocations.is_revoked(claims.jti):
+        raise HTTPException(status_code=401, detail="Token revoked")
+    return claims
+
+async def require_editor(claims: TokenClaims = Depends(get_token_claims)) -> TokenClaims:
+    if claims.role not in ("admin", "editor"):
+        raise HTTPException(status_code=403, detail="Editor role required")
+    return claims
+
+async def get_current_user(claims: TokenClaims = Depends(get_token_claims)) -> User:
+    user = user_cache.get(claims.id)
+    if user is None:
+        user_doc = await db.users.find_one({"id": claims.id}, {"_id": 0, "password_hash": 0})
+        if user_doc is None:
+            raise HTTPException(status_code=401, detail="User not found")
+        user = User(**user_doc)
+        user_cache.put(user)
+    return user
+
+async def registration_role(requested: Optional[str], credentials: Optional[HTTPAuthorizationCredentials]) -> str:
+    """Self-registration yields a viewer; only an admin assigns roles. The first
+    account on an empty database is the admin, so a fresh install can be set up."""
+    if requested is not None and requested not in USER_ROLES:
+        raise HTTPException(status_code=400, detail=f"role must be one of {', '.join(USER_ROLES)}")
+    if credentials is not None:
+        try:
+            claims = await get_token_claims(credentials)
+        except HTTPException:
+            # A stale token left in the client is no reason to refuse a sign-up
+            claims = None
+        if claims is not None and claims.role == "admin":
+            return requested or "viewer"
+    if await db.users.find_one({}, {"_id": 1}) is None:
+        return "admin"
+    return "viewer"
 
 # ============ AUTH ROUTES ============
 
 @api_router.post("/auth/register", response_model=User)
-async def register(user_data: UserCreate):
+async def register(user_data: UserCreate,
+                   credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)):
     # Check if user exists
     existing_user = await db.users.find_one({"email": user_data.email})
     if existing_user:
@@ -202,14 +703,14 @@ async def register(user_data: UserCreate):
     user = User(
         name=user_data.name,
         email=user_data.email,
-        role=user_data.role
+        role=await registration_role(user_data.role, credentials)
     )
     
     doc = user.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['password_hash'] = get_password_hash(user_data.password)
+    doc['password_hash'] = await password_hasher.hash(user_data.password)
     
     await db.users.insert_one(doc)
+    user_cache.invalidate(user.id)
     return user
 
 @api_router.post("/auth/login", response_model=Token)
@@ -218,238 +719,1499 @@ async def login(user_data: UserLogin):
     if not user_doc:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    if not verify_password(user_data.password, user_doc.get('password_hash', '')):
+    if not await password_hasher.verify(user_data.password, user_doc.get('password_hash', '')):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    if isinstance(user_doc.get('created_at'), str):
-        user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
-    
     user = User(**user_doc)
-    access_token = create_access_token(data={"sub": user.id})
+    user_cache.put(user)
+    access_token = create_access_token(user)
     
     return Token(access_token=access_token, token_type="bearer", user=user)
 
+@api_router.post("/auth/logout")
+async def logout(claims: TokenClaims = Depends(get_token_claims)):
+    token_revocations.revoke(claims.jti, claims.exp)
+    return {"message": "Logged out"}
+
+@api_router.get("/auth/metrics")
+async def get_auth_metrics():
+    """Password pool saturation and hash/verify latency (including queueing)"""
+    return password_hasher.metrics()
+
+@api_router.get("/auth/me", response_model=User)
+async def get_me(user: User = Depends(get_current_user)):
+    return user
+
 # ============ CHANNEL ROUTES ============
 
 @api_router.post("/channels", response_model=Channel)
 async def create_channel(channel_data: ChannelCreate):
     channel = Channel(**channel_data.model_dump())
     doc = channel.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.channels.insert_one(doc)
+    collection_versions.bump("channels")
     return channel
 
 @api_router.get("/channels", response_model=List[Channel])
-async def get_channels():
+async def get_channels(cache_headers: dict = Depends(cache_validators("channels"))):
     channels = await db.channels.find({}, {"_id": 0}).to_list(100)
-    for ch in channels:
-        if isinstance(ch.get('created_at'), str):
-            ch['created_at'] = datetime.fromisoformat(ch['created_at'])
-    return channels
+    return FastJSONResponse(shape_rows(Channel, channels), headers=cache_headers)
 
 @api_router.get("/channels/{channel_id}", response_model=Channel)
 async def get_channel(channel_id: str):
     channel = await db.channels.find_one({"id": channel_id}, {"_id": 0})
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
-    if isinstance(channel.get('created_at'), str):
-        channel['created_at'] = datetime.fromisoformat(channel['created_at'])
     return Channel(**channel)
 
 # ============ PROGRAM ROUTES ============
 
 @api_router.post("/programs", response_model=Program)
-async def create_program(program_data: ProgramCreate, user_id: str = "system"):
-    program = Program(**program_data.model_dump(), created_by=user_id)
+async def create_program(program_data: ProgramCreate, claims: TokenClaims = Depends(require_editor)):
+    program = Program(**program_data.model_dump(), created_by=claims.id)
     doc = program.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.programs.insert_one(doc)
+    collection_versions.bump("programs")
     return program
 
 @api_router.get("/programs", response_model=List[Program])
-async def get_programs(channel_id: Optional[str] = None):
+async def get_programs(
+    channel_id: Optional[str] = None,
+    from_time: Optional[datetime] = Query(None, alias="from"),
+    to_time: Optional[datetime] = Query(None, alias="to"),
+    limit: int = Query(PAGE_SIZE_MAX, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    cache_headers: dict = Depends(cache_validators("programs"))
+):
+    """Programs ordered by (created_at, id); from/to filter on created_at"""
+    include = parse_fields(fields, Program)
     query = {"channel_id": channel_id} if channel_id else {}
-    programs = await db.programs.find(query, {"_id": 0}).to_list(1000)
-    for prog in programs:
-        if isinstance(prog.get('created_at'), str):
-            prog['created_at'] = datetime.fromisoformat(prog['created_at'])
-    return programs
+    window = {}
+    if from_time:
+        window["$gte"] = as_utc(from_time)
+    if to_time:
+        window["$lt"] = as_utc(to_time)
+    if window:
+        query["created_at"] = window
+    if cursor:
+        query.update(keyset_filter("created_at", cursor))
+
+    projection = {"_id": 0}
+    if include is not None:
+        projection.update({name: 1 for name in include | {"created_at"}})
+    programs = await db.programs.find(query, projection).sort([("created_at", 1), ("id", 1)]).to_list(limit + 1)
+    return page_response(programs, limit, "created_at", Program, include, cache_headers)
 
 @api_router.get("/programs/{program_id}", response_model=Program)
 async def get_program(program_id: str):
     program = await db.programs.find_one({"id": program_id}, {"_id": 0})
     if not program:
         raise HTTPException(status_code=404, detail="Program not found")
-    if isinstance(program.get('created_at'), str):
-        program['created_at'] = datetime.fromisoformat(program['created_at'])
     return Program(**program)
 
-@api_router.delete("/programs/{program_id}")
+@api_router.delete("/programs/{program_id}", dependencies=[Depends(require_editor)])
 async def delete_program(program_id: str):
     result = await db.programs.delete_one({"id": program_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Program not found")
+    timeline_index.drop_program(program_id)
+    epg_cache.invalidate()
+    collection_versions.bump("programs")
     return {"message": "Program deleted"}
 
+# ============ RECURRENCE RULES ============
+
+# Window used when a schedule read does not name one
+RULE_DEFAULT_HORIZON_DAYS = 7
+
+def validate_rule(rule_data: ScheduleRuleCreate):
+    if rule_data.kind == "daily":
+        if not rule_data.slots:
+            raise HTTPException(status_code=400, detail="Daily rules need at least one slot")
+        for slot in rule_data.slots:
+            try:
+                hour, minute = (int(part) for part in slot.start.split(":"))
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid slot start {slot.start!r}, expected HH:MM")
+            if not (0 <= hour < 24 and 0 <= minute < 60) or slot.duration_minutes <= 0:
+                raise HTTPException(status_code=400, detail=f"Invalid slot {slot.start} ({slot.duration_minutes} min)")
+    elif rule_data.kind == "rotation":
+        if not rule_data.program_ids or not rule_data.slot_minutes or rule_data.slot_minutes <= 0:
+            raise HTTPException(status_code=400, detail="Rotation rules need program_ids and a positive slot_minutes")
+    else:
+        raise HTTPException(status_code=400, detail="kind must be 'daily' or 'rotation'")
+
+def expand_rule(rule: ScheduleRule, window_start: datetime, window_end: datetime) -> List[ScheduleItem]:
+    """Occurrences of a rule overlapping [window_start, window_end).
+
+    Only the occurrences inside the window are generated, so the cost depends
+    on the window and not on how far the rule reaches. Occurrence ids are
+    derived from the rule id and start time and are stable across calls.
+    """
+    valid_from = as_utc(rule.valid_from)
+    valid_until = as_utc(rule.valid_until) if rule.valid_until else None
+    occurrences = []
+    if rule.kind == "daily":
+        longest = timedelta(minutes=max(slot.duration_minutes for slot in rule.slots))
+        day = max(window_start - longest, valid_from).date()
+        while day <= window_end.date():
+            midnight = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+            for slot in rule.slots:
+                hour, minute = (int(part) for part in slot.start.split(":"))
+                start = midnight + timedelta(hours=hour, minutes=minute)
+                occurrences.append((start, start + timedelta(minutes=slot.duration_minutes), slot.program_id))
+            day += timedelta(days=1)
+    else:
+        step = timedelta(minutes=rule.slot_minutes)
+        k = max(int((window_start - valid_from) / step), 0)
+        start = valid_from + k * step
+        while start < window_end:
+            occurrences.append((start, start + step, rule.program_ids[k % len(rule.program_ids)]))
+            k += 1
+            start = valid_from + k * step
+
+    now = datetime.now(timezone.utc)
+    items = []
+    for start, end, program_id in sorted(occurrences):
+        if start < valid_from or (valid_until and start >= valid_until):
+            continue
+        if end <= window_start or start >= window_end:
+            continue
+        status = "completed" if end <= now else "running" if start <= now else "scheduled"
+        items.append(ScheduleItem(
+            id=f"{rule.id}@{start.strftime('%Y%m%dT%H%M%SZ')}",
+            program_id=program_id,
+            channel_id=rule.channel_id,
+            start_time=start,
+            end_time=end,
+            is_live=rule.is_live,
+            status=status,
+            rule_id=rule.id,
+            created_at=rule.created_at,
+            updated_at=rule.created_at
+        ))
+    return items
+
+def suppress_overridden(occurrences: List[ScheduleItem], items: List[ScheduleItem]) -> List[ScheduleItem]:
+    """Drop rule occurrences overlapping a materialized item of any status (the exceptions)"""
+    booked = sorted((as_utc(item.start_time), as_utc(item.end_time)) for item in items)
+    starts = [b[0] for b in booked]
+    max_ends = []
+    for b in booked:
+        max_ends.append(max(max_ends[-1], b[1]) if max_ends else b[1])
+    kept = []
+    for occurrence in occurrences:
+        pos = bisect.bisect_left(starts, as_utc(occurrence.end_time))
+        if pos == 0 or max_ends[pos - 1] <= as_utc(occurrence.start_time):
+            kept.append(occurrence)
+    return kept
+
+async def expand_channel_rules(channel_id: Optional[str], window_start: datetime, window_end: datetime,
+                               items: List[ScheduleItem], rules: Optional[list] = None) -> List[ScheduleItem]:
+    """Expanded, exception-filtered occurrences of all rules of a channel (or all channels)"""
+    if rules is None:
+        query = {"channel_id": channel_id} if channel_id else {}
+        rules = await db.schedule_rules.find(query, {"_id": 0}).to_list(None)
+    occurrences: dict = {}
+    for rule in rules:
+        expanded = expand_rule(ScheduleRule(**rule), window_start, window_end)
+        occurrences.setdefault(rule['channel_id'], []).extend(expanded)
+    items_by_channel: dict = {}
+    for item in items:
+        items_by_channel.setdefault(item.channel_id, []).append(item)
+    kept = []
+    for rule_channel_id, channel_occurrences in occurrences.items():
+        kept.extend(suppress_overridden(channel_occurrences, items_by_channel.get(rule_channel_id, [])))
+    return sorted(kept, key=lambda item: item.start_time)
+
+# ============ CONFLICT INDEX ============
+
+# Upper bound on how long a channel's conflict tree is trusted. Writes through
+# this process update it immediately; writes made elsewhere are picked up when
+# the tree is rebuilt from storage, at most this many seconds after the last build.
+CONFLICT_INDEX_MAX_AGE_SECONDS = float(os.environ.get('CONFLICT_INDEX_MAX_AGE_SECONDS', '30'))
+
+class IntervalNode:
+    __slots__ = ("start", "end", "item_id", "program_id", "priority", "left", "right", "max_end")
+
+    def __init__(self, start: datetime, end: datetime, item_id: str, program_id: Optional[str]):
+        self.start = start
+        self.end = end
+        self.item_id = item_id
+        self.program_id = program_id
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.max_end = end
+
+    def key(self) -> tuple:
+        return (self.start, self.item_id)
+
+class IntervalTree:
+    """Half-open [start, end) intervals in a treap keyed by (start, item_id).
+
+    Every node carries the largest end in its subtree, so add/remove are
+    O(log n) expected and overlapping() is O(log n + k) for k results.
+    """
+
+    def __init__(self):
+        self.root: Optional[IntervalNode] = None
+        self.nodes: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self.nodes
+
+    @staticmethod
+    def refresh(node: IntervalNode):
+        node.max_end = node.end
+        if node.left is not None and node.left.max_end > node.max_end:
+            node.max_end = node.left.max_end
+        if node.right is not None and node.right.max_end > node.max_end:
+            node.max_end = node.right.max_end
+
+    def split(self, node: Optional[IntervalNode], key: tuple):
+        """(keys < key, keys >= key)"""
+        if node is None:
+            return None, None
+        if node.key() < key:
+            node.right, right = self.split(node.right, key)
+            self.refresh(node)
+            return node, right
+        left, node.left = self.split(node.left, key)
+        self.refresh(node)
+        return left, node
+
+    def merge(self, left: Optional[IntervalNode], right: Optional[IntervalNode]):
+        """Join two treaps where every key of left is below every key of right"""
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self.merge(left.right, right)
+            self.refresh(left)
+            return left
+        right.left = self.merge(left, right.left)
+        self.refresh(right)
+        return right
+
+    def add(self, item_id: str, start: datetime, end: datetime, program_id: Optional[str] = None):
+        self.remove(item_id)
+        node = IntervalNode(start, end, item_id, program_id)
+        left, right = self.split(self.root, node.key())
+        self.root = self.merge(self.merge(left, node), right)
+        self.nodes[item_id] = node
+
+    def remove(self, item_id: str) -> bool:
+        node = self.nodes.pop(item_id, None)
+        if node is None:
+            return False
+        self.root = self.delete(self.root, node.key())
+        return True
+
+    def delete(self, node: IntervalNode, key: tuple) -> Optional[IntervalNode]:
+        if node.key() == key:
+            return self.merge(node.left, node.right)
+        if key < node.key():
+            node.left = self.delete(node.left, key)
+        else:
+            node.right = self.delete(node.right, key)
+        self.refresh(node)
+        return node
+
+    def overlapping(self, start: datetime, end: datetime) -> List[IntervalNode]:
+        """Every interval overlapping [start, end), ordered by (start, item_id)"""
+        found = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            # Nothing in this subtree ends after start
+            if node is None or node.max_end <= start:
+                continue
+            stack.append(node.left)
+            # Right subtree starts at or after node.start, so only if node.start < end
+            if node.start < end:
+                if node.end > start:
+                    found.append(node)
+                stack.append(node.right)
+        found.sort(key=IntervalNode.key)
+        return found
+
+class ConflictIndex:
+    """Per-channel interval trees of active schedule items.
+
+    Validates creates, moves and batches without a database query. Write routes
+    keep it current through add_item/remove_item/invalidate and hold lock(channel)
+    across check-and-write so concurrent requests cannot double-book a slot.
+    """
+
+    def __init__(self, max_age: float = CONFLICT_INDEX_MAX_AGE_SECONDS):
+        self.max_age = max_age
+        self.trees: dict = {}
+        self.loaded_at: dict = {}
+        self.load_locks: dict = {}
+        self.write_locks: dict = {}
+
+    def lock(self, channel_id: str) -> asyncio.Lock:
+        return self.write_locks.setdefault(channel_id, asyncio.Lock())
+
+    def is_fresh(self, channel_id: str) -> bool:
+        loaded_at = self.loaded_at.get(channel_id)
+        return loaded_at is not None and time.monotonic() - loaded_at < self.max_age
+
+    async def get(self, channel_id: str) -> IntervalTree:
+        if self.is_fresh(channel_id):
+            return self.trees[channel_id]
+        async with self.load_locks.setdefault(channel_id, asyncio.Lock()):
+            if not self.is_fresh(channel_id):
+                tree = IntervalTree()
+                cursor = db.schedule_items.find(
+                    {"channel_id": channel_id, "status": {"$in": list(ACTIVE_SCHEDULE_STATUSES)}},
+                    {"_id": 0, "id": 1, "program_id": 1, "start_time": 1, "end_time": 1}
+                )
+                async for doc in cursor:
+                    tree.add(doc['id'], as_utc(doc['start_time']), as_utc(doc['end_time']), doc.get('program_id'))
+                self.trees[channel_id] = tree
+                self.loaded_at[channel_id] = time.monotonic()
+        return self.trees[channel_id]
+
+    async def conflicts(self, channel_id: str, start: datetime, end: datetime, exclude=()) -> List[IntervalNode]:
+        tree = await self.get(channel_id)
+        return [node for node in tree.overlapping(start, end) if node.item_id not in exclude]
+
+    def add_item(self, item: ScheduleItem):
+        """Apply a created or updated item to its channel's tree, if built"""
+        self.remove_item(item.id)
+        tree = self.trees.get(item.channel_id)
+        if tree is not None and item.status in ACTIVE_SCHEDULE_STATUSES:
+            tree.add(item.id, as_utc(item.start_time), as_utc(item.end_time), item.program_id)
+
+    def remove_item(self, item_id: str):
+        for tree in self.trees.values():
+            if tree.remove(item_id):
+                return
+
+    def invalidate(self, channel_id: Optional[str] = None):
+        """Rebuild one channel (None: every channel) from storage on next use"""
+        for key in [channel_id] if channel_id else list(self.loaded_at):
+            self.loaded_at.pop(key, None)
+
+conflict_index = ConflictIndex()
+
+def conflict_detail(conflicts: List[IntervalNode]) -> str:
+    return "Schedule conflict detected: overlaps " + ", ".join(node.item_id for node in conflicts)
+
+# ============ TIMELINE INDEX ============
+
+# Upper bound on how stale a channel's in-memory timeline may get. Writes made
+# through this process update the index immediately; writes made elsewhere
+# (other workers, scripts talking to Mongo directly) become visible once the
+# channel is reloaded, which happens at most this many seconds after the last load.
+TIMELINE_MAX_AGE_SECONDS = float(os.environ.get('TIMELINE_MAX_AGE_SECONDS', '30'))
+# How far ahead recurrence rules are expanded into the index on each load
+TIMELINE_RULE_HORIZON = timedelta(days=1)
+
+ACTIVE_SCHEDULE_STATUSES = ("scheduled", "running")
+
+class TimelineEntry:
+    __slots__ = ("start", "end", "item", "program")
+
+    def __init__(self, item: "ScheduleItem", program: Optional["Program"]):
+        self.start = as_utc(item.start_time)
+        self.end = as_utc(item.end_time)
+        self.item = item
+        self.program = program
+
+class ChannelTimeline:
+    """Upcoming schedule items of one channel, sorted by start time"""
+
+    def __init__(self):
+        self.starts: List[datetime] = []
+        self.entries: List[TimelineEntry] = []
+        self.loaded_at = time.monotonic()
+
+    def insert(self, entry: TimelineEntry):
+        idx = bisect.bisect_right(self.starts, entry.start)
+        self.starts.insert(idx, entry.start)
+        self.entries.insert(idx, entry)
+
+    def remove(self, item_id: str) -> bool:
+        for idx, entry in enumerate(self.entries):
+            if entry.item.id == item_id:
+                del self.starts[idx]
+                del self.entries[idx]
+                return True
+        return False
+
+    def lookup(self, now: datetime):
+        """Return (current, next) entries for the given instant"""
+        idx = bisect.bisect_right(self.starts, now)
+        current = None
+        # Active items of a channel never overlap (enforced on create), so only
+        # the last item starting at or before now can be on air.
+        if idx > 0 and self.entries[idx - 1].end > now:
+            current = self.entries[idx - 1]
+        upcoming = None
+        for entry in self.entries[idx:]:
+            if entry.item.status == "scheduled":
+                upcoming = entry
+                break
+        return current, upcoming
+
+    def next_boundary(self, now: datetime) -> Optional[datetime]:
+        """Earliest start or end time strictly after now"""
+        idx = bisect.bisect_right(self.starts, now)
+        boundary = self.starts[idx] if idx < len(self.starts) else None
+        if idx > 0 and self.entries[idx - 1].end > now:
+            end = self.entries[idx - 1].end
+            boundary = end if boundary is None else min(boundary, end)
+        return boundary
+
+class TimelineIndex:
+    """In-process per-channel interval index joined with program documents.
+
+    Serves now-playing lookups with a bisect instead of database queries. Write
+    routes keep it current through upsert_item/remove_item/drop_program, and
+    listeners are called with the affected channel id (None for all channels).
+    """
+
+    def __init__(self, max_age: float = TIMELINE_MAX_AGE_SECONDS):
+        self.max_age = max_age
+        self.channels: dict = {}
+        self.item_channels: dict = {}
+        self.locks: dict = {}
+        self.listeners: list = []
+        # Channels with recurrence rules; item writes there reload the channel
+        # so overridden occurrences are recomputed
+        self.rule_channels: set = set()
+
+    def changed(self, channel_id: Optional[str]):
+        for listener in self.listeners:
+            listener(channel_id)
+
+    def is_fresh(self, timeline: Optional[ChannelTimeline]) -> bool:
+        return timeline is not None and time.monotonic() - timeline.loaded_at < self.max_age
+
+    async def get(self, channel_id: str) -> ChannelTimeline:
+        timeline = self.channels.get(channel_id)
+        if self.is_fresh(timeline):
+            return timeline
+        lock = self.locks.setdefault(channel_id, asyncio.Lock())
+        async with lock:
+            timeline = self.channels.get(channel_id)
+            if not self.is_fresh(timeline):
+                timeline = await self.load(channel_id)
+        return timeline
+
+    async def load(self, channel_id: str) -> ChannelTimeline:
+        now = datetime.now(timezone.utc)
+        docs = await db.schedule_items.find({
+            "channel_id": channel_id,
+            "end_time": {"$gt": now}
+        }, {"_id": 0}).to_list(None)
+        # Cancelled items stay in the list so they can suppress rule occurrences
+        items = [ScheduleItem(**doc) for doc in docs]
+        occurrences = await expand_channel_rules(channel_id, now, now + TIMELINE_RULE_HORIZON, items)
+        if occurrences:
+            self.rule_channels.add(channel_id)
+        else:
+            self.rule_channels.discard(channel_id)
+        items = [item for item in items if item.status in ACTIVE_SCHEDULE_STATUSES] + occurrences
+
+        program_ids = list({item.program_id for item in items})
+        programs = {}
+        if program_ids:
+            async for program in db.programs.find({"id": {"$in": program_ids}}, {"_id": 0}):
+                programs[program['id']] = Program(**program)
+
+        timeline = ChannelTimeline()
+        for schedule_item in items:
+            if as_utc(schedule_item.end_time) > now:
+                timeline.insert(TimelineEntry(schedule_item, programs.get(schedule_item.program_id)))
+
+        old = self.channels.get(channel_id)
+        if old is not None:
+            for entry in old.entries:
+                self.item_channels.pop(entry.item.id, None)
+        for entry in timeline.entries:
+            self.item_channels[entry.item.id] = channel_id
+        self.channels[channel_id] = timeline
+        return timeline
+
+    async def upsert_item(self, item: ScheduleItem):
+        """Apply a created or updated schedule item to an already loaded channel"""
+        if item.channel_id in self.rule_channels:
+            self.invalidate(item.channel_id)
+            return
+        self.remove_item(item.id)
+        timeline = self.channels.get(item.channel_id)
+        if timeline is None:
+            return
+        if item.status not in ACTIVE_SCHEDULE_STATUSES or as_utc(item.end_time) <= datetime.now(timezone.utc):
+            return
+        program = next((e.program for e in timeline.entries if e.item.program_id == item.program_id), None)
+        if program is None:
+            program_doc = await db.programs.find_one({"id": item.program_id}, {"_id": 0})
+            if program_doc:
+                program = Program(**program_doc)
+        timeline.insert(TimelineEntry(item, program))
+        self.item_channels[item.id] = item.channel_id
+        self.changed(item.channel_id)
+
+    def invalidate(self, channel_id: str):
+        """Forget a channel so it is reloaded on next use (cheaper than many upserts)"""
+        timeline = self.channels.pop(channel_id, None)
+        if timeline is not None:
+            for entry in timeline.entries:
+                self.item_channels.pop(entry.item.id, None)
+        self.changed(channel_id)
+
+    def remove_item(self, item_id: str, channel_id: Optional[str] = None):
+        channel_id = self.item_channels.pop(item_id, None) or channel_id
+        if channel_id in self.rule_channels:
+            self.invalidate(channel_id)
+            return
+        timeline = self.channels.get(channel_id)
+        if timeline is not None and timeline.remove(item_id):
+            self.changed(channel_id)
+
+    def set_status(self, item_id: str, status: str):
+        timeline = self.channels.get(self.item_channels.get(item_id))
+        if timeline is None:
+            return
+        for entry in timeline.entries:
+            if entry.item.id == item_id:
+                entry.item = entry.item.model_copy(update={"status": status})
+                break
+
+    def drop_program(self, program_id: str):
+        for timeline in self.channels.values():
+            for entry in timeline.entries:
+                if entry.item.program_id == program_id:
+                    entry.program = None
+        self.changed(None)
+
+    async def now_playing(self, channel_id: str) -> NowPlaying:
+        timeline = await self.get(channel_id)
+        current, upcoming = timeline.lookup(datetime.now(timezone.utc))
+        result = NowPlaying()
+        if current:
+            result.schedule_item = current.item
+            result.program = current.program
+        if upcoming:
+            result.next_start_time = upcoming.item.start_time
+            result.next_program = upcoming.program
+        return result
+
+timeline_index = TimelineIndex()
+
+@api_router.delete("/programs", dependencies=[Depends(require_editor)])
+async def delete_programs(criteria: ProgramBulkDelete = Body(...)):
+    """Delete programs by id list and/or channel, cascading to their schedule items"""
+    query = {}
+    if criteria.ids is not None:
+        query["id"] = {"$in": criteria.ids}
+    if criteria.channel_id:
+        query["channel_id"] = criteria.channel_id
+    if not query:
+        raise HTTPException(status_code=400, detail="Provide ids or channel_id")
+
+    programs = await db.programs.find(query, {"_id": 0, "id": 1, "channel_id": 1}).to_list(None)
+    program_ids = [p['id'] for p in programs]
+    if not program_ids:
+        return {"message": "Programs deleted", "programs_deleted": 0, "schedule_items_deleted": 0}
+
+    result = await db.programs.delete_many({"id": {"$in": program_ids}})
+    cascaded = await db.schedule_items.delete_many({"program_id": {"$in": program_ids}})
+    for channel_id in {p['channel_id'] for p in programs}:
+        timeline_index.invalidate(channel_id)
+        conflict_index.invalidate(channel_id)
+    epg_cache.invalidate()
+    collection_versions.bump("programs", "schedule")
+    return {
+        "message": "Programs deleted",
+        "programs_deleted": result.deleted_count,
+        "schedule_items_deleted": cascaded.deleted_count
+    }
+
+# ============ SCHEDULE COVERAGE ============
+
+# Longest window GET /api/schedule/coverage analyses in one request
+COVERAGE_MAX_DAYS = int(os.environ.get('COVERAGE_MAX_DAYS', '366'))
+
+def coverage_sweep(window_start: float, window_end: float, starts, ends, min_gap: float = 0.0) -> dict:
+    """Gaps, overlaps and fill of [window_start, window_end) in one vectorized pass.
+
+    starts/ends are epoch seconds of the slots sorted by start, already
+    clipped to the window. The running max of ends is the frontier of
+    airtime so far: a slot starting after the previous frontier opens a gap,
+    one starting before it overlaps the slot holding the frontier.
+    """
+    if len(starts) == 0:
+        gap = window_end - window_start
+        return {
+            "gaps": [(window_start, window_end)] if gap > min_gap else [],
+            "overlaps": [], "gap_seconds": gap, "overlap_seconds": 0.0, "filled_seconds": 0.0
+        }
+    frontier = np.maximum.accumulate(ends)
+    # Index of the slot holding the frontier at each position
+    positions = np.arange(len(ends))
+    holder = np.maximum.accumulate(np.where(ends >= frontier, positions, 0))
+    previous = np.concatenate(([window_start], frontier[:-1]))
+    previous_holder = np.concatenate(([-1], holder[:-1]))
+
+    gap_starts = np.append(previous, frontier[-1])
+    gap_ends = np.append(starts, window_end)
+    gap_lengths = gap_ends - gap_starts
+    gap_mask = gap_lengths > 0
+    gap_seconds = float(gap_lengths[gap_mask].sum())
+    shown = gap_mask & (gap_lengths > min_gap)
+
+    overlap_ends = np.minimum(ends, previous)
+    overlap_lengths = overlap_ends - starts
+    overlap_mask = (overlap_lengths > 0) & (previous_holder >= 0)
+    return {
+        "gaps": list(zip(gap_starts[shown].tolist(), gap_ends[shown].tolist())),
+        "overlaps": list(zip(starts[overlap_mask].tolist(), overlap_ends[overlap_mask].tolist(),
+                             positions[overlap_mask].tolist(), previous_holder[overlap_mask].tolist())),
+        "gap_seconds": gap_seconds,
+        "overlap_seconds": float(overlap_lengths[overlap_mask].sum()),
+        "filled_seconds": (window_end - window_start) - gap_seconds
+    }
+
+def program_airtime(program_ids: list, durations) -> list:
+    """(program_id, slots, airtime seconds) per program, most airtime first"""
+    if not program_ids:
+        return []
+    # Dense codes by first appearance; np.unique on object arrays sorts in Python
+    codes: dict = {}
+    inverse = np.fromiter((codes.setdefault(pid, len(codes)) for pid in program_ids), np.intp, len(program_ids))
+    unique = list(codes)
+    slots = np.bincount(inverse, minlength=len(unique))
+    airtime = np.bincount(inverse, weights=durations, minlength=len(unique))
+    order = np.argsort(-airtime, kind="stable")
+    return [(unique[i], int(slots[i]), float(airtime[i])) for i in order]
+
+def to_epoch(value: datetime) -> float:
+    return as_utc(value).timestamp()
+
+def from_epoch(value: float) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+async def airing_slots(channel_id: str, window_start: datetime, window_end: datetime) -> list:
+    """Items and rule occurrences airing in [window_start, window_end), sorted by start.
+
+    Cancelled items are left out but still hide the occurrences they overlap.
+    Rows are plain namespaces: building models for tens of thousands of them
+    costs more than the sweep.
+    """
+    docs = await db.schedule_items.find({
+        "channel_id": channel_id,
+        "start_time": {"$lt": window_end},
+        "end_time": {"$gt": window_start}
+    }, {"_id": 0, "id": 1, "program_id": 1, "start_time": 1, "end_time": 1, "status": 1}).sort(
+        [("start_time", 1), ("id", 1)]).to_list(None)
+    stored = [SimpleNamespace(channel_id=channel_id, **doc) for doc in docs]
+    occurrences = await expand_channel_rules(channel_id, window_start, window_end, stored)
+    slots = [item for item in stored if item.status != "cancelled"] + occurrences
+    if occurrences:
+        slots.sort(key=lambda item: (as_utc(item.start_time), item.id))
+    return slots
+
+def slot_arrays(slots: list, low: float, high: float) -> tuple:
+    """Epoch start and end arrays of the slots, clipped to [low, high]"""
+    starts = np.fromiter((to_epoch(item.start_time) for item in slots), np.float64, len(slots))
+    ends = np.fromiter((to_epoch(item.end_time) for item in slots), np.float64, len(slots))
+    return np.clip(starts, low, high), np.clip(ends, low, high)
+
+# ============ AUTO-FILL ============
+
+# Slot lengths are program durations rounded up to this many seconds. Coarser
+# steps make more gap lengths exactly fillable and the planning tables smaller.
+AUTOFILL_GRANULARITY_SECONDS = int(os.environ.get('AUTOFILL_GRANULARITY_SECONDS', '60'))
+# Upper bound on the items one auto-fill request may create
+AUTOFILL_MAX_ITEMS = int(os.environ.get('AUTOFILL_MAX_ITEMS', '50000'))
+
+class FillTable:
+    """Which gap lengths (in steps) a sum of slot lengths fills exactly.
+
+    Lengths are divided by their gcd; beyond the product of the smallest and
+    largest reduced length every length is a sum (Schur's bound on the
+    Frobenius number), so the table only reaches that far. Each length is
+    merged in log2(limit / length) shifted ORs.
+    """
+
+    def __init__(self, lengths, limit: int):
+        self.gcd = int(np.gcd.reduce(lengths))
+        reduced = sorted({int(length) // self.gcd for length in lengths})
+        self.limit = min(limit // self.gcd, reduced[0] * reduced[-1])
+        table = np.zeros(self.limit + 1, dtype=bool)
+        table[0] = True
+        for length in reduced:
+            shift = length
+            while shift <= self.limit:
+                table[shift:] |= table[:-shift]
+                shift *= 2
+        self.table = table
+
+    def fits(self, steps):
+        """Vectorized over an array of step counts"""
+        steps = np.asarray(steps)
+        quotient, remainder = np.divmod(steps, self.gcd)
+        inside = np.minimum(quotient, self.limit)
+        return (steps >= 0) & (remainder == 0) & ((quotient > self.limit) | self.table[np.maximum(inside, 0)])
+
+    def largest_fit(self, steps: int) -> int:
+        """Longest exactly fillable length not above steps"""
+        steps -= steps % self.gcd
+        while steps > 0 and not self.fits(steps):
+            steps -= self.gcd
+        return max(steps, 0)
+
+def plan_autofill(gaps: list, lengths, weights) -> tuple:
+    """Pack slots into gaps -> ([(gap index, offset steps, program index)], [(gap index, filled steps)]).
+
+    gaps are lengths in steps; lengths and weights are per program. Every gap
+    is filled up to its longest exactly fillable length, left to right.
+    Within a gap the next program is the one furthest behind its weighted
+    share of airtime so far (smooth weighted round robin), skipping any
+    whose length would leave a remainder no combination fills (the
+    lookahead), so airtime tracks the weights and programs interleave.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    shares = np.asarray(weights, dtype=np.float64) / float(np.sum(weights))
+    table = FillTable(lengths, max(gaps, default=0))
+    credit = np.zeros(len(lengths))
+    placements = []
+    filled = []
+    for gap_index, gap in enumerate(gaps):
+        remaining = table.largest_fit(gap)
+        filled.append((gap_index, remaining))
+        offset = 0
+        while remaining > 0:
+            feasible = (lengths <= remaining) & table.fits(remaining - lengths)
+            pick = int(np.argmax(np.where(feasible, credit, -np.inf)))
+            credit += shares * lengths[pick]
+            credit[pick] -= lengths[pick]
+            placements.append((gap_index, offset, pick))
+            offset += int(lengths[pick])
+            remaining -= int(lengths[pick])
+    return placements, filled
+
+async def autofill_pool(channel_id: str, pool: List[AutofillPoolEntry]) -> tuple:
+    """Resolve pool entries to (programs, weights) of the channel's programs with a duration"""
+    programs = await db.programs.find({"channel_id": channel_id}, {"_id": 0}).to_list(None)
+    by_id = {program['id']: program for program in programs}
+    usable = lambda program: (program.get('duration_seconds') or 0) > 0
+    weights: dict = {}
+    if not pool:
+        for program in programs:
+            if usable(program):
+                weights[program['id']] = 1.0
+    for entry in pool:
+        if entry.program_id:
+            program = by_id.get(entry.program_id)
+            if program is None:
+                raise HTTPException(status_code=400, detail=f"Program {entry.program_id} not found on this channel")
+            if not usable(program):
+                raise HTTPException(status_code=400, detail=f"Program {entry.program_id} has no duration_seconds")
+            weights[program['id']] = weights.get(program['id'], 0.0) + entry.weight
+        elif entry.tag:
+            tag = entry.tag.strip().lower()
+            matched = [program for program in programs if usable(program)
+                       and tag in {t.strip().lower() for t in (program.get('tags') or "").split(",")}]
+            if not matched:
+                raise HTTPException(status_code=400, detail=f"No program with a duration is tagged {entry.tag}")
+            for program in matched:
+                weights[program['id']] = weights.get(program['id'], 0.0) + entry.weight / len(matched)
+        else:
+            raise HTTPException(status_code=400, detail="Each pool entry needs a program_id or a tag")
+    if not weights:
+        raise HTTPException(status_code=400, detail="No program with a duration to fill with")
+    return [by_id[program_id] for program_id in weights], list(weights.values())
+
 # ============ SCHEDULE ROUTES ============
 
-@api_router.post("/schedule", response_model=ScheduleItem)
+@api_router.post("/schedule", response_model=ScheduleItem, dependencies=[Depends(require_editor)])
 async def create_schedule_item(schedule_data: ScheduleItemCreate):
-    # Check for conflicts
-    conflicts = await db.schedule_items.find({
-        "channel_id": schedule_data.channel_id,
-        "status": {"$in": ["scheduled", "running"]},
-        "$or": [
-            {
-                "start_time": {"$lt": schedule_data.end_time.isoformat()},
-                "end_time": {"$gt": schedule_data.start_time.isoformat()}
-            }
-        ]
-    }).to_list(10)
-    
-    if conflicts:
-        raise HTTPException(status_code=409, detail="Schedule conflict detected")
-    
     schedule_item = ScheduleItem(**schedule_data.model_dump())
-    doc = schedule_item.model_dump()
-    doc['start_time'] = doc['start_time'].isoformat()
-    doc['end_time'] = doc['end_time'].isoformat()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
-    
-    await db.schedule_items.insert_one(doc)
+    schedule_item.start_time = as_utc(schedule_item.start_time)
+    schedule_item.end_time = as_utc(schedule_item.end_time)
+    if schedule_item.end_time <= schedule_item.start_time:
+        raise HTTPException(status_code=400, detail="end_time must be after start_time")
+
+    async with conflict_index.lock(schedule_item.channel_id):
+        conflicts = await conflict_index.conflicts(schedule_item.channel_id, schedule_item.start_time,
+                                                   schedule_item.end_time)
+        if conflicts:
+            raise HTTPException(status_code=409, detail=conflict_detail(conflicts))
+        await db.schedule_items.insert_one(schedule_item.model_dump())
+        conflict_index.add_item(schedule_item)
+    await timeline_index.upsert_item(schedule_item)
+    epg_cache.invalidate(schedule_item.start_time, schedule_item.end_time, schedule_item.channel_id)
+    collection_versions.bump("schedule")
+    scheduler_engine.arm(schedule_item)
     return schedule_item
 
+def plan_bulk_schedule(items: List[ScheduleItemCreate], existing: dict) -> List[ScheduleBulkResult]:
+    """Decide which items of a bulk request can be created.
+
+    existing maps channel_id to the (start, end, id) tuples of active items
+    overlapping the request's range. Items are sorted per channel, then swept
+    once: an item is rejected if it overlaps an existing item (bisect over the
+    prefix max of existing end times) or an earlier accepted item of the batch.
+    O(n log n) overall.
+    """
+    results = [ScheduleBulkResult(index=i, status="created") for i in range(len(items))]
+    by_channel: dict = {}
+    for i, item in enumerate(items):
+        start, end = as_utc(item.start_time), as_utc(item.end_time)
+        if end <= start:
+            results[i].status = "invalid"
+            results[i].detail = "end_time must be after start_time"
+            continue
+        by_channel.setdefault(item.channel_id, []).append((start, end, i))
+
+    for channel_id, candidates in by_channel.items():
+        booked = sorted(existing.get(channel_id, []))
+        booked_starts = [b[0] for b in booked]
+        max_ends = []
+        for b in booked:
+            max_ends.append(max(max_ends[-1], b[1]) if max_ends else b[1])
+
+        candidates.sort()
+        accepted_end = None
+        accepted_index = None
+        for start, end, i in candidates:
+            pos = bisect.bisect_left(booked_starts, end)
+            if pos > 0 and max_ends[pos - 1] > start:
+                clash = next(b[2] for b in reversed(booked[:pos]) if b[1] > start)
+                results[i].status = "conflict"
+                results[i].detail = f"Overlaps existing schedule item {clash}"
+            elif accepted_end is not None and start < accepted_end:
+                results[i].status = "conflict"
+                results[i].detail = f"Overlaps item {accepted_index} of this batch"
+            else:
+                accepted_end, accepted_index = end, i
+    return results
+
+@api_router.post("/schedule/bulk", response_model=ScheduleBulkResponse, dependencies=[Depends(require_editor)])
+async def create_schedule_bulk(bulk_data: ScheduleBulkCreate):
+    """Create many schedule items, checked against the conflict index, with one insert_many"""
+    ranges: dict = {}
+    for item in bulk_data.items:
+        start, end = as_utc(item.start_time), as_utc(item.end_time)
+        low, high = ranges.get(item.channel_id, (start, end))
+        ranges[item.channel_id] = (min(low, start), max(high, end))
+
+    async with AsyncExitStack() as stack:
+        # Sorted so two bulk requests never wait on each other's locks
+        for channel_id in sorted(ranges):
+            await stack.enter_async_context(conflict_index.lock(channel_id))
+
+        existing = {}
+        for channel_id, (low, high) in ranges.items():
+            nodes = await conflict_index.conflicts(channel_id, low, high)
+            existing[channel_id] = [(node.start, node.end, node.item_id) for node in nodes]
+
+        results = plan_bulk_schedule(bulk_data.items, existing)
+        failed = sum(1 for r in results if r.status != "created")
+        if failed and bulk_data.all_or_nothing:
+            for result in results:
+                if result.status == "created":
+                    result.status = "skipped"
+            response = ScheduleBulkResponse(created=0, failed=failed, results=results)
+            raise HTTPException(status_code=409, detail=response.model_dump())
+
+        schedule_items = []
+        for result in results:
+            if result.status != "created":
+                continue
+            schedule_item = ScheduleItem(**bulk_data.items[result.index].model_dump())
+            schedule_item.start_time = as_utc(schedule_item.start_time)
+            schedule_item.end_time = as_utc(schedule_item.end_time)
+            result.id = schedule_item.id
+            schedule_items.append(schedule_item)
+
+        if schedule_items:
+            await db.schedule_items.insert_many([item.model_dump() for item in schedule_items], ordered=False)
+            for schedule_item in schedule_items:
+                conflict_index.add_item(schedule_item)
+
+    if schedule_items:
+        for channel_id in {item.channel_id for item in schedule_items}:
+            timeline_index.invalidate(channel_id)
+        for schedule_item in schedule_items:
+            epg_cache.invalidate(schedule_item.start_time, schedule_item.end_time, schedule_item.channel_id)
+        collection_versions.bump("schedule")
+        for schedule_item in schedule_items:
+            scheduler_engine.arm(schedule_item)
+
+    return ScheduleBulkResponse(created=len(schedule_items), failed=failed, results=results)
+
+@api_router.post("/schedule/validate", response_model=ScheduleValidateResponse, dependencies=[Depends(require_editor)])
+async def validate_schedule(request: ScheduleValidateRequest):
+    """Check creates and moves against stored items and each other without writing anything.
+
+    Items carrying an id are moves of that stored item, which is left out of
+    every check. Each result lists all conflicting stored items and batch indexes.
+    """
+    moving = {item.id for item in request.items if item.id}
+    results = [ScheduleValidateResult(index=i, status="ok") for i in range(len(request.items))]
+    batch_trees: dict = {}
+    for i, item in enumerate(request.items):
+        start, end = as_utc(item.start_time), as_utc(item.end_time)
+        if end <= start:
+            results[i].status = "invalid"
+            results[i].detail = "end_time must be after start_time"
+            continue
+        batch_trees.setdefault(item.channel_id, IntervalTree()).add(str(i), start, end)
+        conflicts = await conflict_index.conflicts(item.channel_id, start, end, exclude=moving)
+        results[i].conflicts = [
+            ScheduleConflict(id=node.item_id, program_id=node.program_id, start_time=node.start, end_time=node.end)
+            for node in conflicts
+        ]
+
+    for i, item in enumerate(request.items):
+        if results[i].status == "invalid":
+            continue
+        tree = batch_trees[item.channel_id]
+        node = tree.nodes[str(i)]
+        results[i].batch_conflicts = sorted(int(other.item_id) for other in tree.overlapping(node.start, node.end)
+                                            if other.item_id != str(i))
+        if results[i].conflicts or results[i].batch_conflicts:
+            results[i].status = "conflict"
+
+    return ScheduleValidateResponse(valid=all(r.status == "ok" for r in results), results=results)
+
+@api_router.post("/schedule/autofill", response_model=ScheduleAutofillResponse, dependencies=[Depends(require_editor)])
+async def autofill_schedule(request: ScheduleAutofillRequest):
+    """Fill the gaps of [start_time, end_time) back to back from a weighted program pool.
+
+    Slot lengths come from duration_seconds. Existing items and rule
+    occurrences stay where they are; the new items go in with one
+    insert_many under the channel's write lock.
+    """
+    window_start, window_end = as_utc(request.start_time), as_utc(request.end_time)
+    if window_end <= window_start:
+        raise HTTPException(status_code=400, detail="end_time must be after start_time")
+    if window_end - window_start > timedelta(days=COVERAGE_MAX_DAYS):
+        raise HTTPException(status_code=400, detail=f"Window is limited to {COVERAGE_MAX_DAYS} days")
+    step = request.granularity_seconds or AUTOFILL_GRANULARITY_SECONDS
+    programs, weights = await autofill_pool(request.channel_id, request.pool)
+    lengths = [-(-program['duration_seconds'] // step) for program in programs]
+
+    async with conflict_index.lock(request.channel_id):
+        low, high = window_start.timestamp(), window_end.timestamp()
+        slots = await airing_slots(request.channel_id, window_start, window_end)
+        gaps = coverage_sweep(low, high, *slot_arrays(slots, low, high))["gaps"]
+        gap_steps = [int((end - start) // step) for start, end in gaps]
+        if sum(gap_steps) // min(lengths) > AUTOFILL_MAX_ITEMS:
+            raise HTTPException(status_code=400, detail=f"Auto-fill is limited to {AUTOFILL_MAX_ITEMS} items per request")
+        placements, filled = plan_autofill(gap_steps, lengths, weights)
+
+        schedule_items = []
+        for gap_index, offset, pick in placements:
+            start = from_epoch(gaps[gap_index][0] + offset * step)
+            schedule_items.append(ScheduleItem(
+                program_id=programs[pick]['id'], channel_id=request.channel_id,
+                start_time=start, end_time=start + timedelta(seconds=lengths[pick] * step)
+            ))
+        if schedule_items and not request.dry_run:
+            await db.schedule_items.insert_many([item.model_dump() for item in schedule_items], ordered=False)
+            for schedule_item in schedule_items:
+                conflict_index.add_item(schedule_item)
+
+    if schedule_items and not request.dry_run:
+        timeline_index.invalidate(request.channel_id)
+        for schedule_item in schedule_items:
+            epg_cache.invalidate(schedule_item.start_time, schedule_item.end_time, schedule_item.channel_id)
+        collection_versions.bump("schedule")
+        for schedule_item in schedule_items:
+            scheduler_engine.arm(schedule_item)
+
+    unfilled = []
+    for gap_index, steps in filled:
+        start, end = gaps[gap_index][0] + steps * step, gaps[gap_index][1]
+        if end > start:
+            unfilled.append(CoverageInterval(start_time=from_epoch(start), end_time=from_epoch(end), duration_seconds=end - start))
+    return ScheduleAutofillResponse(
+        created=0 if request.dry_run else len(schedule_items),
+        dry_run=request.dry_run,
+        filled_seconds=float(sum(steps for _, steps in filled) * step),
+        unfilled=unfilled,
+        items=schedule_items
+    )
+
 @api_router.get("/schedule", response_model=List[ScheduleItem])
-async def get_schedule(channel_id: Optional[str] = None, date: Optional[str] = None):
+async def get_schedule(
+    channel_id: Optional[str] = None,
+    date: Optional[str] = None,
+    from_time: Optional[datetime] = Query(None, alias="from"),
+    to_time: Optional[datetime] = Query(None, alias="to"),
+    limit: int = Query(PAGE_SIZE_MAX, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    cache_headers: dict = Depends(cache_validators("schedule"))
+):
+    """Stored items and rule occurrences starting in [from, to), ordered by (start_time, id).
+
+    When more rows match, X-Next-Cursor carries the cursor for the next page.
+    With Accept: application/x-ndjson every matching row is streamed instead,
+    one JSON object per line, ignoring limit.
+    """
+    include = parse_fields(fields, ScheduleItem)
     query = {}
     if channel_id:
         query["channel_id"] = channel_id
     if date:
-        start_date = datetime.fromisoformat(date)
+        start_date = as_utc(datetime.fromisoformat(date))
         end_date = start_date + timedelta(days=1)
         query["start_time"] = {
-            "$gte": start_date.isoformat(),
-            "$lt": end_date.isoformat()
+            "$gte": start_date,
+            "$lt": end_date
         }
-    
-    items = await db.schedule_items.find(query, {"_id": 0}).sort("start_time", 1).to_list(1000)
-    for item in items:
-        if isinstance(item.get('start_time'), str):
-            item['start_time'] = datetime.fromisoformat(item['start_time'])
-        if isinstance(item.get('end_time'), str):
-            item['end_time'] = datetime.fromisoformat(item['end_time'])
-        if isinstance(item.get('created_at'), str):
-            item['created_at'] = datetime.fromisoformat(item['created_at'])
-        if isinstance(item.get('updated_at'), str):
-            item['updated_at'] = datetime.fromisoformat(item['updated_at'])
-    return items
+    else:
+        window = {}
+        if from_time:
+            window["$gte"] = as_utc(from_time)
+        if to_time:
+            window["$lt"] = as_utc(to_time)
+        if window:
+            query["start_time"] = window
+        # Recurrence rules are unbounded, so expand them over a default horizon
+        start_date = as_utc(from_time) if from_time else datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        end_date = as_utc(to_time) if to_time else start_date + timedelta(days=RULE_DEFAULT_HORIZON_DAYS)
+    after = None
+    if cursor:
+        after = decode_cursor(cursor)
+        query.update(keyset_filter("start_time", cursor))
+
+    # Most channels have no rules: then no occurrences and no stored rows to build
+    rules = await db.schedule_rules.find({"channel_id": channel_id} if channel_id else {}, {"_id": 0}).to_list(None)
+
+    occurrences = []
+    if rules:
+        # Suppression needs every stored item overlapping the rule window, not
+        # just this page's: one starting before from or before the cursor
+        # still hides the occurrences it overlaps
+        overlap = {"start_time": {"$lt": end_date}, "end_time": {"$gt": start_date}}
+        if channel_id:
+            overlap["channel_id"] = channel_id
+        overriding = await db.schedule_items.find(
+            overlap, {"_id": 0, "channel_id": 1, "start_time": 1, "end_time": 1}).to_list(None)
+        occurrences = await expand_channel_rules(channel_id, start_date, end_date,
+                                                 [SimpleNamespace(**item) for item in overriding], rules)
+        # Expansion returns everything overlapping the window; list occurrences
+        # by start in [from, to) like the stored items
+        occurrences = [o for o in occurrences if o.start_time >= start_date]
+
+    if wants_ndjson(accept):
+        extra = [o.model_dump() for o in occurrences if after is None or (o.start_time, o.id) > after]
+        rows = db.schedule_items.find(query, {"_id": 0}).sort([("start_time", 1), ("id", 1)]).batch_size(EXPORT_BATCH_SIZE)
+        return StreamingResponse(ndjson_merge(rows, extra, ScheduleItem, include), media_type=NDJSON_MEDIA_TYPE,
+                                 headers=cache_headers)
+
+    # limit + 1 stored items are enough: any page is the smallest `limit`
+    # keys of stored items and occurrences together
+    items = await db.schedule_items.find(query, {"_id": 0}).sort([("start_time", 1), ("id", 1)]).to_list(limit + 1)
+    if after is not None:
+        occurrences = [o for o in occurrences if (o.start_time, o.id) > after]
+    if occurrences:
+        items = sorted(items + [o.model_dump() for o in occurrences],
+                       key=lambda item: (as_utc(item['start_time']), item['id']))
+    return page_response(items, limit, "start_time", ScheduleItem, include, cache_headers)
+
+@api_router.delete("/schedule", dependencies=[Depends(require_editor)])
+async def clear_schedule(
+    channel_id: str,
+    from_time: Optional[datetime] = Query(None, alias="from"),
+    to_time: Optional[datetime] = Query(None, alias="to")
+):
+    """Delete a channel's schedule items starting in [from, to) with one delete_many"""
+    query = {"channel_id": channel_id}
+    window = {}
+    if from_time:
+        window["$gte"] = as_utc(from_time)
+    if to_time:
+        window["$lt"] = as_utc(to_time)
+    if window:
+        query["start_time"] = window
+
+    result = await db.schedule_items.delete_many(query)
+    timeline_index.invalidate(channel_id)
+    conflict_index.invalidate(channel_id)
+    epg_cache.invalidate()
+    collection_versions.bump("schedule")
+    return {"message": "Schedule cleared", "deleted": result.deleted_count}
+
+@api_router.post("/schedule/rules", response_model=ScheduleRule, dependencies=[Depends(require_editor)])
+async def create_schedule_rule(rule_data: ScheduleRuleCreate):
+    """Store a recurrence rule; its occurrences are expanded on read"""
+    validate_rule(rule_data)
+    rule = ScheduleRule(**rule_data.model_dump())
+    rule.valid_from = as_utc(rule.valid_from)
+    if rule.valid_until:
+        rule.valid_until = as_utc(rule.valid_until)
+    await db.schedule_rules.insert_one(rule.model_dump())
+    timeline_index.invalidate(rule.channel_id)
+    epg_cache.invalidate()
+    collection_versions.bump("schedule")
+    return rule
+
+@api_router.get("/schedule/rules", response_model=List[ScheduleRule])
+async def get_schedule_rules(channel_id: Optional[str] = None):
+    query = {"channel_id": channel_id} if channel_id else {}
+    return await db.schedule_rules.find(query, {"_id": 0}).to_list(1000)
+
+@api_router.delete("/schedule/rules/{rule_id}", dependencies=[Depends(require_editor)])
+async def delete_schedule_rule(rule_id: str):
+    rule = await db.schedule_rules.find_one_and_delete({"id": rule_id}, {"_id": 0, "channel_id": 1})
+    if rule is None:
+        raise HTTPException(status_code=404, detail="Schedule rule not found")
+    timeline_index.invalidate(rule['channel_id'])
+    epg_cache.invalidate()
+    collection_versions.bump("schedule")
+    return {"message": "Schedule rule deleted"}
+
+@api_router.post("/schedule/rules/{rule_id}/materialize", response_model=ScheduleItem, dependencies=[Depends(require_editor)])
+async def materialize_occurrence(rule_id: str, data: RuleMaterialize):
+    """Turn one occurrence into a stored schedule item so it can be edited or cancelled"""
+    rule_doc = await db.schedule_rules.find_one({"id": rule_id}, {"_id": 0})
+    if rule_doc is None:
+        raise HTTPException(status_code=404, detail="Schedule rule not found")
+    start = as_utc(data.start_time)
+    occurrence = next((o for o in expand_rule(ScheduleRule(**rule_doc), start, start + timedelta(seconds=1))
+                       if as_utc(o.start_time) == start), None)
+    if occurrence is None:
+        raise HTTPException(status_code=404, detail="Rule has no occurrence starting at that time")
+    existing = await db.schedule_items.find_one({
+        "channel_id": occurrence.channel_id,
+        "start_time": {"$lt": occurrence.end_time},
+        "end_time": {"$gt": occurrence.start_time}
+    }, {"_id": 0, "id": 1})
+    if existing:
+        raise HTTPException(status_code=409, detail=f"Occurrence already overridden by {existing['id']}")
+
+    schedule_item = ScheduleItem(**occurrence.model_dump(exclude={"id", "status", "created_at", "updated_at"}))
+    await db.schedule_items.insert_one(schedule_item.model_dump())
+    conflict_index.add_item(schedule_item)
+    timeline_index.invalidate(schedule_item.channel_id)
+    epg_cache.invalidate(schedule_item.start_time, schedule_item.end_time, schedule_item.channel_id)
+    collection_versions.bump("schedule")
+    scheduler_engine.arm(schedule_item)
+    return schedule_item
 
-@api_router.put("/schedule/{schedule_id}", response_model=ScheduleItem)
+@api_router.put("/schedule/{schedule_id}", response_model=ScheduleItem, dependencies=[Depends(require_editor)])
 async def update_schedule_item(schedule_id: str, update_data: ScheduleItemUpdate):
     existing = await db.schedule_items.find_one({"id": schedule_id}, {"_id": 0})
     if not existing:
         raise HTTPException(status_code=404, detail="Schedule item not found")
     
     update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
-    if update_dict:
-        if 'start_time' in update_dict:
-            update_dict['start_time'] = update_dict['start_time'].isoformat()
-        if 'end_time' in update_dict:
-            update_dict['end_time'] = update_dict['end_time'].isoformat()
-        update_dict['updated_at'] = datetime.now(timezone.utc).isoformat()
-        await db.schedule_items.update_one({"id": schedule_id}, {"$set": update_dict})
-    
-    updated = await db.schedule_items.find_one({"id": schedule_id}, {"_id": 0})
-    if isinstance(updated.get('start_time'), str):
-        updated['start_time'] = datetime.fromisoformat(updated['start_time'])
-    if isinstance(updated.get('end_time'), str):
-        updated['end_time'] = datetime.fromisoformat(updated['end_time'])
-    if isinstance(updated.get('created_at'), str):
-        updated['created_at'] = datetime.fromisoformat(updated['created_at'])
-    if isinstance(updated.get('updated_at'), str):
-        updated['updated_at'] = datetime.fromisoformat(updated['updated_at'])
-    return ScheduleItem(**updated)
-
-@api_router.delete("/schedule/{schedule_id}")
+    if 'start_time' in update_dict:
+        update_dict['start_time'] = as_utc(update_dict['start_time'])
+    if 'end_time' in update_dict:
+        update_dict['end_time'] = as_utc(update_dict['end_time'])
+    start = update_dict.get('start_time', as_utc(existing['start_time']))
+    end = update_dict.get('end_time', as_utc(existing['end_time']))
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end_time must be after start_time")
+
+    async with conflict_index.lock(existing['channel_id']):
+        # Moving an item, or reactivating one, must not land on another active item
+        if update_dict.get('status', existing.get('status')) in ACTIVE_SCHEDULE_STATUSES:
+            conflicts = await conflict_index.conflicts(existing['channel_id'], start, end, exclude={schedule_id})
+            if conflicts:
+                raise HTTPException(status_code=409, detail=conflict_detail(conflicts))
+        if update_dict:
+            update_dict['updated_at'] = datetime.now(timezone.utc)
+            await db.schedule_items.update_one({"id": schedule_id}, {"$set": update_dict})
+        updated = await db.schedule_items.find_one({"id": schedule_id}, {"_id": 0})
+        schedule_item = ScheduleItem(**updated)
+        conflict_index.add_item(schedule_item)
+    await timeline_index.upsert_item(schedule_item)
+    epg_cache.invalidate(existing['start_time'], existing['end_time'], schedule_item.channel_id)
+    epg_cache.invalidate(schedule_item.start_time, schedule_item.end_time, schedule_item.channel_id)
+    collection_versions.bump("schedule")
+    scheduler_engine.arm(schedule_item)
+    return schedule_item
+
+@api_router.delete("/schedule/{schedule_id}", dependencies=[Depends(require_editor)])
 async def delete_schedule_item(schedule_id: str):
-    result = await db.schedule_items.delete_one({"id": schedule_id})
-    if result.deleted_count == 0:
+    deleted = await db.schedule_items.find_one_and_delete(
+        {"id": schedule_id}, {"_id": 0, "channel_id": 1, "start_time": 1, "end_time": 1})
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Schedule item not found")
+    timeline_index.remove_item(schedule_id, deleted['channel_id'])
+    conflict_index.remove_item(schedule_id)
+    epg_cache.invalidate(deleted['start_time'], deleted['end_time'], deleted['channel_id'])
+    collection_versions.bump("schedule")
+    scheduler_engine.disarm(schedule_id)
     return {"message": "Schedule item deleted"}
 
+@api_router.get("/schedule/coverage", response_model=ScheduleCoverage)
+async def get_schedule_coverage(
+    channel_id: str,
+    from_time: Optional[datetime] = Query(None, alias="from"),
+    to_time: Optional[datetime] = Query(None, alias="to"),
+    min_gap_seconds: float = Query(0, ge=0)
+):
+    """Dead air, double bookings, fill ratio and per-program airtime of [from, to).
+
+    Covers stored items that are not cancelled plus rule occurrences; slots are
+    clipped to the window. Defaults to the next 7 days from now.
+    """
+    window_start = as_utc(from_time) if from_time else datetime.now(timezone.utc)
+    window_end = as_utc(to_time) if to_time else window_start + timedelta(days=RULE_DEFAULT_HORIZON_DAYS)
+    if window_end <= window_start:
+        raise HTTPException(status_code=400, detail="to must be after from")
+    if window_end - window_start > timedelta(days=COVERAGE_MAX_DAYS):
+        raise HTTPException(status_code=400, detail=f"Window is limited to {COVERAGE_MAX_DAYS} days")
+
+    slots = await airing_slots(channel_id, window_start, window_end)
+    low, high = window_start.timestamp(), window_end.timestamp()
+    starts, ends = slot_arrays(slots, low, high)
+    sweep = coverage_sweep(low, high, starts, ends, min_gap_seconds)
+
+    airtime = program_airtime([item.program_id for item in slots], ends - starts)
+    titles = {}
+    if airtime:
+        async for program in db.programs.find({"id": {"$in": [row[0] for row in airtime]}}, {"_id": 0, "id": 1, "title": 1}):
+            titles[program['id']] = program.get('title')
+
+    return FastJSONResponse({
+        "channel_id": channel_id,
+        "start_time": window_start,
+        "end_time": window_end,
+        "items": len(slots),
+        "filled_seconds": sweep["filled_seconds"],
+        "gap_seconds": sweep["gap_seconds"],
+        "overlap_seconds": sweep["overlap_seconds"],
+        "fill_ratio": sweep["filled_seconds"] / (high - low),
+        "gaps": [
+            {"start_time": from_epoch(start), "end_time": from_epoch(end), "duration_seconds": end - start}
+            for start, end in sweep["gaps"]
+        ],
+        "overlaps": [
+            {"start_time": from_epoch(start), "end_time": from_epoch(end), "duration_seconds": end - start,
+             "item_ids": [slots[later].id, slots[earlier].id]}
+            for start, end, later, earlier in sweep["overlaps"]
+        ],
+        "programs": [
+            {"program_id": program_id, "title": titles.get(program_id), "slots": count, "airtime_seconds": seconds}
+            for program_id, count, seconds in airtime
+        ]
+    })
+
 @api_router.get("/schedule/now-playing", response_model=NowPlaying)
 async def get_now_playing(channel_id: str):
-    now = datetime.now(timezone.utc).isoformat()
-    
-    # Find currently running item
-    current = await db.schedule_items.find_one({
-        "channel_id": channel_id,
-        "start_time": {"$lte": now},
-        "end_time": {"$gt": now},
-        "status": {"$in": ["scheduled", "running"]}
-    }, {"_id": 0})
-    
-    result = NowPlaying()
-    
-    if current:
-        if isinstance(current.get('start_time'), str):
-            current['start_time'] = datetime.fromisoformat(current['start_time'])
-        if isinstance(current.get('end_time'), str):
-            current['end_time'] = datetime.fromisoformat(current['end_time'])
-        if isinstance(current.get('created_at'), str):
-            current['created_at'] = datetime.fromisoformat(current['created_at'])
-        if isinstance(current.get('updated_at'), str):
-            current['updated_at'] = datetime.fromisoformat(current['updated_at'])
-        result.schedule_item = ScheduleItem(**current)
-        
-        # Get program details
-        program = await db.programs.find_one({"id": current['program_id']}, {"_id": 0})
-        if program:
-            if isinstance(program.get('created_at'), str):
-                program['created_at'] = datetime.fromisoformat(program['created_at'])
-            result.program = Program(**program)
-    
-    # Find next program
-    next_item = await db.schedule_items.find_one({
-        "channel_id": channel_id,
-        "start_time": {"$gt": now},
-        "status": "scheduled"
-    }, {"_id": 0}, sort=[("start_time", 1)])
-    
-    if next_item:
-        if isinstance(next_item.get('start_time'), str):
-            next_item['start_time'] = datetime.fromisoformat(next_item['start_time'])
-        result.next_start_time = next_item['start_time']
-        
-        next_program = await db.programs.find_one({"id": next_item['program_id']}, {"_id": 0})
-        if next_program:
-            if isinstance(next_program.get('created_at'), str):
-                next_program['created_at'] = datetime.fromisoformat(next_program['created_at'])
-            result.next_program = Program(**next_program)
-    
-    return result
+    """Answered from the in-memory timeline index, see TIMELINE_MAX_AGE_SECONDS"""
+    return await timeline_index.now_playing(channel_id)
+
+# ============ EPG ============
+
+# Writes through this process drop the hours they touch immediately; writes
+# made elsewhere show up once a bucket is this many seconds old
+EPG_CACHE_MAX_AGE_SECONDS = float(os.environ.get('EPG_CACHE_MAX_AGE_SECONDS', '30'))
+# Hour buckets kept in memory, least recently used dropped first
+EPG_CACHE_MAX_HOURS = int(os.environ.get('EPG_CACHE_MAX_HOURS', '336'))
+# Longest window GET /api/epg answers in one request
+EPG_MAX_HOURS = int(os.environ.get('EPG_MAX_HOURS', '168'))
+EPG_DEFAULT_HOURS = 24
+
+def floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+def rule_occurrence_length(rule: dict) -> timedelta:
+    if rule['kind'] == "daily":
+        return timedelta(minutes=max(slot['duration_minutes'] for slot in rule['slots']))
+    return timedelta(minutes=rule['slot_minutes'])
+
+class EpgCache:
+    """The guide of all channels in hour buckets, {channel_id: [rows]} each.
+
+    A bucket holds every item and rule occurrence airing during its hour, so
+    an item spanning several hours sits in each of them and a window is the
+    union of its hours. Missing hours are loaded in contiguous runs, one
+    range query and one program lookup per run. Schedule writes drop the
+    hours they touch; on a channel with rules the range is widened by the
+    longest rule occurrence, since an item hides or reveals every
+    occurrence it overlaps.
+    """
+
+    def __init__(self, max_age: float = EPG_CACHE_MAX_AGE_SECONDS, max_hours: int = EPG_CACHE_MAX_HOURS):
+        self.max_age = max_age
+        self.max_hours = max_hours
+        self.buckets: OrderedDict = OrderedDict()  # hour -> (loaded_at, {channel_id: [rows]})
+        self.generation = 0
+        # Channels with rules and their longest occurrence, as of the last load
+        self.rule_channels: set = set()
+        self.longest = timedelta(0)
+        self.lock = asyncio.Lock()
+
+    def cached(self, hour: datetime) -> Optional[dict]:
+        entry = self.buckets.get(hour)
+        if entry is None or time.monotonic() - entry[0] >= self.max_age:
+            return None
+        self.buckets.move_to_end(hour)
+        return entry[1]
+
+    async def get(self, hours: List[datetime]) -> List[dict]:
+        """Buckets of the given consecutive hours, loading the missing ones"""
+        found = {hour: self.cached(hour) for hour in hours}
+        missing = [hour for hour, bucket in found.items() if bucket is None]
+        if missing:
+            async with self.lock:
+                runs = []
+                for hour in missing:
+                    # Another request may have loaded it while this one waited
+                    bucket = self.cached(hour)
+                    if bucket is not None:
+                        found[hour] = bucket
+                    elif runs and runs[-1][1] == hour:
+                        runs[-1][1] = hour + timedelta(hours=1)
+                    else:
+                        runs.append([hour, hour + timedelta(hours=1)])
+                for run_start, run_end in runs:
+                    found.update(await self.load(run_start, run_end))
+        return [found[hour] for hour in hours]
+
+    async def load(self, run_start: datetime, run_end: datetime) -> dict:
+        generation = self.generation
+        # Ranged on (end_time, start_time): past items never enter the scan
+        docs = await db.schedule_items.find({
+            "end_time": {"$gt": run_start},
+            "start_time": {"$lt": run_end}
+        }, {"_id": 0, "id": 1, "channel_id": 1, "program_id": 1, "start_time": 1, "end_time": 1,
+            "is_live": 1, "status": 1}).sort([("start_time", 1), ("id", 1)]).to_list(None)
+        stored = [SimpleNamespace(**doc) for doc in docs]
+        rules = await db.schedule_rules.find({}, {"_id": 0}).to_list(None)
+        self.rule_channels = {rule['channel_id'] for rule in rules}
+        self.longest = max((rule_occurrence_length(rule) for rule in rules), default=timedelta(0))
+        occurrences = await expand_channel_rules(None, run_start, run_end, stored, rules)
+        slots = [item for item in stored if item.status != "cancelled"] + occurrences
+        slots.sort(key=lambda item: (as_utc(item.start_time), item.id))
+
+        programs = {}
+        program_ids = list({item.program_id for item in slots})
+        if program_ids:
+            async for program in db.programs.find({"id": {"$in": program_ids}},
+                                                  {"_id": 0, "id": 1, "title": 1, "duration_seconds": 1}):
+                programs[program['id']] = program
+
+        hours = {}
+        hour = run_start
+        while hour < run_end:
+            hours[hour] = {}
+            hour += timedelta(hours=1)
+        for item in slots:
+            start, end = as_utc(item.start_time), as_utc(item.end_time)
+            program = programs.get(item.program_id, {})
+            row = {
+                "id": item.id,
+                "program_id": item.program_id,
+                "title": program.get('title'),
+                "duration_seconds": program.get('duration_seconds'),
+                "start_time": start,
+                "end_time": end,
+                "is_live": item.is_live,
+                "rule_id": getattr(item, 'rule_id', None)
+            }
+            hour = floor_hour(max(start, run_start))
+            while hour < min(end, run_end):
+                hours[hour].setdefault(item.channel_id, []).append(row)
+                hour += timedelta(hours=1)
+
+        # A write during the load may not be reflected in what was read
+        if generation == self.generation:
+            loaded_at = time.monotonic()
+            for hour, bucket in hours.items():
+                self.buckets[hour] = (loaded_at, bucket)
+                self.buckets.move_to_end(hour)
+            while len(self.buckets) > self.max_hours:
+                self.buckets.popitem(last=False)
+        return hours
+
+    def invalidate(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                   channel_id: Optional[str] = None):
+        """Drop the hours overlapping [start, end), or every hour"""
+        self.generation += 1
+        if start is None or end is None:
+            self.buckets.clear()
+            return
+        if channel_id in self.rule_channels:
+            start, end = start - self.longest, end + self.longest
+        hour, end = floor_hour(as_utc(start)), as_utc(end)
+        while hour < end:
+            self.buckets.pop(hour, None)
+            hour += timedelta(hours=1)
+
+epg_cache = EpgCache()
+
+@api_router.get("/epg", response_model=EpgGrid)
+async def get_epg(
+    from_time: Optional[datetime] = Query(None, alias="from"),
+    to_time: Optional[datetime] = Query(None, alias="to"),
+    channels: Optional[str] = None,
+    cache_headers: dict = Depends(cache_validators("schedule", "programs"))
+):
+    """Guide grid of [from, to) for all channels, or the comma-separated channel ids.
+
+    Items come with their program's title and duration, grouped by channel
+    and ordered by start. Served from epg_cache's hour buckets.
+    """
+    window_start = as_utc(from_time) if from_time else datetime.now(timezone.utc)
+    window_end = as_utc(to_time) if to_time else window_start + timedelta(hours=EPG_DEFAULT_HOURS)
+    if window_end <= window_start:
+        raise HTTPException(status_code=400, detail="to must be after from")
+    if window_end - window_start > timedelta(hours=EPG_MAX_HOURS):
+        raise HTTPException(status_code=400, detail=f"Window is limited to {EPG_MAX_HOURS} hours")
+    wanted = [channel_id for channel_id in (channels or "").split(",") if channel_id] or None
+
+    hours = []
+    hour = floor_hour(window_start)
+    while hour < window_end:
+        hours.append(hour)
+        hour += timedelta(hours=1)
+
+    grid = {channel_id: [] for channel_id in wanted} if wanted else {}
+    seen = set()
+    # Buckets in hour order: an item first appears in the earliest hour it
+    # airs in, so appending new ids keeps each channel ordered by start
+    for bucket in await epg_cache.get(hours):
+        for channel_id in (wanted or bucket):
+            for row in bucket.get(channel_id, ()):
+                if row["id"] not in seen and row["start_time"] < window_end and row["end_time"] > window_start:
+                    seen.add(row["id"])
+                    grid.setdefault(channel_id, []).append(row)
+
+    return FastJSONResponse({"start_time": window_start, "end_time": window_end, "channels": grid},
+                            headers=cache_headers)
 
 # ============ TICKER ROUTES ============
 
-@api_router.post("/ticker", response_model=Ticker)
+@api_router.post("/ticker", response_model=Ticker, dependencies=[Depends(require_editor)])
 async def create_ticker(ticker_data: TickerCreate):
     ticker = Ticker(**ticker_data.model_dump())
     doc = ticker.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.tickers.insert_one(doc)
+    ticker_feed.apply("upsert", ticker.model_dump(mode="json"))
+    collection_versions.bump("tickers")
     return ticker
 
 @api_router.get("/ticker", response_model=List[Ticker])
-async def get_tickers(active_only: bool = True):
+async def get_tickers(active_only: bool = True, cache_headers: dict = Depends(cache_validators("tickers"))):
     query = {"active": True} if active_only else {}
     tickers = await db.tickers.find(query, {"_id": 0}).sort("priority", 1).to_list(100)
-    for ticker in tickers:
-        if isinstance(ticker.get('created_at'), str):
-            ticker['created_at'] = datetime.fromisoformat(ticker['created_at'])
-    return tickers
+    return FastJSONResponse(shape_rows(Ticker, tickers), headers=cache_headers)
 
-@api_router.put("/ticker/{ticker_id}", response_model=Ticker)
+@api_router.put("/ticker/{ticker_id}", response_model=Ticker, dependencies=[Depends(require_editor)])
 async def update_ticker(ticker_id: str, ticker_data: TickerCreate):
     update_dict = ticker_data.model_dump()
     result = await db.tickers.update_one({"id": ticker_id}, {"$set": update_dict})
@@ -457,15 +2219,18 @@ async def update_ticker(ticker_id: str, ticker_data: TickerCreate):
         raise HTTPException(status_code=404, detail="Ticker not found")
     
     updated = await db.tickers.find_one({"id": ticker_id}, {"_id": 0})
-    if isinstance(updated.get('created_at'), str):
-        updated['created_at'] = datetime.fromisoformat(updated['created_at'])
-    return Ticker(**updated)
+    ticker = Ticker(**updated)
+    ticker_feed.apply("upsert", ticker.model_dump(mode="json"))
+    collection_versions.bump("tickers")
+    return ticker
 
-@api_router.delete("/ticker/{ticker_id}")
+@api_router.delete("/ticker/{ticker_id}", dependencies=[Depends(require_editor)])
 async def delete_ticker(ticker_id: str):
     result = await db.tickers.delete_one({"id": ticker_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Ticker not found")
+    ticker_feed.apply("delete", {"id": ticker_id})
+    collection_versions.bump("tickers")
     return {"message": "Ticker deleted"}
 
 # ============ AD ROUTES ============
@@ -474,141 +2239,514 @@ async def delete_ticker(ticker_id: str):
 async def create_ad(ad_data: AdCreate):
     ad = Ad(**ad_data.model_dump())
     doc = ad.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.ads.insert_one(doc)
+    collection_versions.bump("ads")
     return ad
 
 @api_router.get("/ads", response_model=List[Ad])
-async def get_ads(active_only: bool = True):
+async def get_ads(active_only: bool = True, cache_headers: dict = Depends(cache_validators("ads"))):
     query = {"active": True} if active_only else {}
     ads = await db.ads.find(query, {"_id": 0}).sort("priority", 1).to_list(100)
-    for ad in ads:
-        if isinstance(ad.get('created_at'), str):
-            ad['created_at'] = datetime.fromisoformat(ad['created_at'])
-    return ads
+    return FastJSONResponse(shape_rows(Ad, ads), headers=cache_headers)
 
 # ============ MINING NEWS RSS FEED ============
 
+# Zimbabwe mining news sources (comma separated override, e.g. for a local stub server)
+MINING_NEWS_FEEDS = os.environ.get(
+    'MINING_NEWS_FEEDS',
+    "https://www.mining.com/feed/,https://www.miningweekly.com/rss-feeds/sections/africa"
+).split(',')
+# Background refresh interval; older data is still served while a refresh runs
+MINING_NEWS_TTL_SECONDS = float(os.environ.get('MINING_NEWS_TTL_SECONDS', '600'))
+# Past this age requests wait for the refresh instead of serving stale items
+MINING_NEWS_MAX_STALE_SECONDS = float(os.environ.get('MINING_NEWS_MAX_STALE_SECONDS', '86400'))
+MINING_NEWS_TIMEOUT_SECONDS = float(os.environ.get('MINING_NEWS_TIMEOUT_SECONDS', '10'))
+
+MINING_NEWS_FALLBACK = [
+    {"text": "Zimbabwe mining sector reports steady growth in Q4", "title": "Mining Update"},
+    {"text": "Gold production reaches new milestone", "title": "Gold News"},
+    {"text": "Green energy initiatives boost mining efficiency", "title": "Energy Update"},
+    {"text": "New mining investments announced for 2025", "title": "Investment News"}
+]
+
+class NewsAggregator:
+    """In-memory cache of the mining news feeds.
+
+    All feeds are fetched concurrently in worker threads with a timeout and a
+    conditional GET (ETag / Last-Modified), so unchanged feeds cost a 304 and
+    no parsing. A feed that fails keeps its last good entries.
+    """
+
+    def __init__(self, feeds: List[str], ttl: float = MINING_NEWS_TTL_SECONDS,
+                 max_stale: float = MINING_NEWS_MAX_STALE_SECONDS, timeout: float = MINING_NEWS_TIMEOUT_SECONDS):
+        self.feeds = feeds
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.timeout = timeout
+        self.validators: dict = {}
+        self.entries: dict = {}
+        self.items: list = []
+        self.fetched_at: Optional[float] = None
+        self.refreshing: Optional[asyncio.Task] = None
+
+    def fetch_feed(self, url: str) -> Optional[list]:
+        """Blocking fetch of one feed; None when the server answered 304"""
+        headers = {}
+        validators = self.validators.get(url, {})
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('modified'):
+            headers['If-Modified-Since'] = validators['modified']
+        response = requests.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        self.validators[url] = {
+            'etag': response.headers.get('ETag'),
+            'modified': response.headers.get('Last-Modified')
+        }
+        feed = feedparser.parse(response.content)
+        return [{
+            "title": entry.get('title', 'Mining News Update'),
+            "text": entry.get('title', 'Mining News Update'),
+            "link": entry.get('link', ''),
+            "published": entry.get('published', '')
+        } for entry in feed.entries[:5]]  # Get 5 latest from each
+
+    async def refresh(self):
+        results = await asyncio.gather(*(
+            asyncio.wait_for(asyncio.to_thread(self.fetch_feed, url), self.timeout + 1)
+            for url in self.feeds
+        ), return_exceptions=True)
+        for url, result in zip(self.feeds, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error fetching feed {url}: {result!r}")
+            elif result is not None:
+                self.entries[url] = result
+        self.items = [item for url in self.feeds for item in self.entries.get(url, [])][:15]
+        self.fetched_at = time.monotonic()
+
+    def revalidate(self) -> asyncio.Task:
+        """Start a refresh unless one is already running"""
+        if self.refreshing is None or self.refreshing.done():
+            self.refreshing = asyncio.create_task(self.refresh())
+        return self.refreshing
+
+    async def get(self) -> list:
+        age = None if self.fetched_at is None else time.monotonic() - self.fetched_at
+        if age is None or age > self.max_stale:
+            await asyncio.shield(self.revalidate())
+        elif age > self.ttl:
+            self.revalidate()  # stale-while-revalidate
+        return self.items or MINING_NEWS_FALLBACK
+
+    async def run(self):
+        while True:
+            try:
+                await self.revalidate()
+            except Exception as e:
+                logger.error(f"Mining news refresh error: {e}")
+            await asyncio.sleep(self.ttl)
+
+mining_news = NewsAggregator(MINING_NEWS_FEEDS)
+
 @api_router.get("/mining-news")
 async def get_mining_news():
-    """Fetch mining news from Zimbabwe sources"""
-    import feedparser
-    
-    news_items = []
-    
-    # Zimbabwe mining news sources
-    feeds = [
-        "https://www.mining.com/feed/",
-        "https://www.miningweekly.com/rss-feeds/sections/africa",
-    ]
-    
+    """Mining news from Zimbabwe sources, served from the in-memory cache"""
     try:
-        for feed_url in feeds:
-            try:
-                feed = feedparser.parse(feed_url)
-                for entry in feed.entries[:5]:  # Get 5 latest from each
-                    news_items.append({
-                        "title": entry.get('title', 'Mining News Update'),
-                        "text": entry.get('title', 'Mining News Update'),
-                        "link": entry.get('link', ''),
-                        "published": entry.get('published', '')
-                    })
-            except Exception as e:
-                logger.error(f"Error parsing feed {feed_url}: {e}")
-                
-        # If no news fetched, use fallback
-        if not news_items:
-            news_items = [
-                {"text": "Zimbabwe mining sector reports steady growth in Q4", "title": "Mining Update"},
-                {"text": "Gold production reaches new milestone", "title": "Gold News"},
-                {"text": "Green energy initiatives boost mining efficiency", "title": "Energy Update"},
-                {"text": "New mining investments announced for 2025", "title": "Investment News"}
-            ]
-            
-        return news_items[:15]  # Return max 15 items
-        
+        return await mining_news.get()
     except Exception as e:
         logger.error(f"Error fetching mining news: {e}")
         return [{"text": "Mining news updates coming soon", "title": "Update"}]
 
 # ============ SCHEDULER ENGINE ============
 
-async def scheduler_engine():
-    """Background task that updates schedule status"""
-    while True:
+# Full reload interval; picks up items written outside this process
+SCHEDULER_RELOAD_SECONDS = float(os.environ.get('SCHEDULER_RELOAD_SECONDS', '300'))
+# Only boundaries this far ahead are kept in memory
+SCHEDULER_HORIZON_SECONDS = 2 * SCHEDULER_RELOAD_SECONDS
+SCHEDULER_RETRY_SECONDS = 5
+
+class SchedulerEngine:
+    """Flips schedule item status at the exact start/end boundary.
+
+    Upcoming boundaries live in a min-heap of (due, seq, item_id, from, to)
+    entries. The engine sleeps until the earliest one is due and applies it
+    with a single conditional update_one. Schedule routes re-arm items through
+    arm/disarm; heap entries whose item moved or disappeared are skipped when
+    popped rather than removed eagerly.
+    """
+
+    def __init__(self):
+        self.heap: list = []
+        self.armed: dict = {}
+        self.seq = 0
+        self.wakeup: Optional[asyncio.Event] = None
+        self.reloaded_at: Optional[float] = None
+        # Items armed by routes while a reload query is in flight
+        self.armed_during_reload: Optional[list] = None
+        self.transitions = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.last_lag = 0.0
+
+    def push(self, due: datetime, item_id: str, from_status: str, to_status: str):
+        self.seq += 1
+        heapq.heappush(self.heap, (due, self.seq, item_id, from_status, to_status))
+
+    def arm(self, item: ScheduleItem):
+        """Track an item's upcoming boundaries, replacing any previous ones"""
+        if self.armed_during_reload is not None:
+            self.armed_during_reload.append(item)
+        self.armed.pop(item.id, None)
+        if item.status not in ACTIVE_SCHEDULE_STATUSES:
+            self.poke()
+            return
+        start, end = as_utc(item.start_time), as_utc(item.end_time)
+        now = datetime.now(timezone.utc)
+        if start > now + timedelta(seconds=SCHEDULER_HORIZON_SECONDS):
+            return
+        self.armed[item.id] = (start, end)
+        if item.status == "scheduled" and end > now:
+            self.push(start, item.id, "scheduled", "running")
+        self.push(end, item.id, "running", "completed")
+        self.poke()
+
+    def disarm(self, item_id: str):
+        if self.armed_during_reload is not None:
+            self.armed_during_reload.append(item_id)
+        self.armed.pop(item_id, None)
+
+    def poke(self):
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    async def reload(self):
+        now = datetime.now(timezone.utc)
+        horizon = now + timedelta(seconds=SCHEDULER_HORIZON_SECONDS)
+        self.armed_during_reload = []
         try:
-            now = datetime.now(timezone.utc).isoformat()
-            
-            # Mark items as running
-            await db.schedule_items.update_many(
-                {
-                    "start_time": {"$lte": now},
-                    "end_time": {"$gt": now},
-                    "status": "scheduled"
-                },
-                {"$set": {"status": "running", "updated_at": now}}
-            )
-            
-            # Mark items as completed
-            await db.schedule_items.update_many(
-                {
-                    "end_time": {"$lte": now},
-                    "status": "running"
-                },
-                {"$set": {"status": "completed", "updated_at": now}}
-            )
-            
-        except Exception as e:
-            logger.error(f"Scheduler engine error: {e}")
-        
-        await asyncio.sleep(10)  # Check every 10 seconds
+            items = await db.schedule_items.find({
+                "start_time": {"$lt": horizon},
+                "$or": [
+                    {"status": "scheduled", "end_time": {"$gt": now}},
+                    {"status": "running"}
+                ]
+            }, {"_id": 0}).to_list(None)
+        finally:
+            changes, self.armed_during_reload = self.armed_during_reload, None
+        self.heap = []
+        self.armed = {}
+        for item in items:
+            self.arm(ScheduleItem(**item))
+        # Replay route writes the query may have missed
+        for change in changes:
+            if isinstance(change, str):
+                self.disarm(change)
+            else:
+                self.arm(change)
+        self.reloaded_at = time.monotonic()
+
+    async def fire(self, due: datetime, item_id: str, from_status: str, to_status: str):
+        now = datetime.now(timezone.utc)
+        result = await db.schedule_items.update_one(
+            {"id": item_id, "status": from_status},
+            {"$set": {"status": to_status, "updated_at": now}}
+        )
+        if result.modified_count:
+            lag = max((now - due).total_seconds(), 0.0)
+            self.transitions += 1
+            self.lag_total += lag
+            self.lag_max = max(self.lag_max, lag)
+            self.last_lag = lag
+            timeline_index.set_status(item_id, to_status)
+            if to_status not in ACTIVE_SCHEDULE_STATUSES:
+                conflict_index.remove_item(item_id)
+            collection_versions.bump("schedule")
+        if to_status == "completed":
+            self.armed.pop(item_id, None)
+
+    async def run(self):
+        self.wakeup = asyncio.Event()
+        while True:
+            self.wakeup.clear()
+            timeout = SCHEDULER_RETRY_SECONDS
+            try:
+                if self.reloaded_at is None or time.monotonic() - self.reloaded_at >= SCHEDULER_RELOAD_SECONDS:
+                    await self.reload()
+                now = datetime.now(timezone.utc)
+                while self.heap and self.heap[0][0] <= now:
+                    due, _, item_id, from_status, to_status = heapq.heappop(self.heap)
+                    start, end = self.armed.get(item_id, (None, None))
+                    if due != (start if to_status == "running" else end):
+                        continue  # item was moved, cancelled or deleted
+                    await self.fire(due, item_id, from_status, to_status)
+                timeout = SCHEDULER_RELOAD_SECONDS - (time.monotonic() - self.reloaded_at)
+                if self.heap:
+                    timeout = min(timeout, (self.heap[0][0] - datetime.now(timezone.utc)).total_seconds())
+            except Exception as e:
+                logger.error(f"Scheduler engine error: {e}")
+
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    def metrics(self) -> dict:
+        return {
+            "transitions": self.transitions,
+            "lag_seconds_avg": self.lag_total / self.transitions if self.transitions else 0.0,
+            "lag_seconds_max": self.lag_max,
+            "lag_seconds_last": self.last_lag,
+            "armed_items": len(self.armed),
+            "pending_boundaries": len(self.heap),
+            "next_boundary": self.heap[0][0] if self.heap else None
+        }
+
+scheduler_engine = SchedulerEngine()
+
+@api_router.get("/scheduler/metrics")
+async def get_scheduler_metrics():
+    """Status transition counts and lag behind the scheduled boundary"""
+    return scheduler_engine.metrics()
 
 # ============ SERVER-SENT EVENTS FOR REAL-TIME UPDATES ============
 
-async def event_generator(channel_id: str) -> AsyncGenerator[str, None]:
-    """Generate server-sent events for now-playing updates"""
-    last_program_id = None
-    
-    while True:
-        try:
-            now = datetime.now(timezone.utc).isoformat()
-            
-            current = await db.schedule_items.find_one({
-                "channel_id": channel_id,
-                "start_time": {"$lte": now},
-                "end_time": {"$gt": now},
-                "status": {"$in": ["scheduled", "running"]}
-            }, {"_id": 0})
-            
-            if current:
-                current_program_id = current.get('program_id')
-                if current_program_id != last_program_id:
-                    program = await db.programs.find_one({"id": current_program_id}, {"_id": 0})
-                    if program:
-                        data = {
-                            "type": "now_playing",
-                            "program": program,
-                            "schedule": current
-                        }
-                        yield f"data: {json.dumps(data, default=str)}\n\n"
-                        last_program_id = current_program_id
-            
-            # Get ticker updates
-            tickers = await db.tickers.find({"active": True}, {"_id": 0}).sort("priority", 1).to_list(50)
-            if tickers:
-                ticker_data = {"type": "ticker", "items": tickers}
-                yield f"data: {json.dumps(ticker_data, default=str)}\n\n"
-            
-        except Exception as e:
-            logger.error(f"Event generator error: {e}")
-        
-        await asyncio.sleep(5)
+# Back-off after a producer error before recomputing
+SSE_RETRY_SECONDS = 5
+# Events buffered per client before it is considered too slow and dropped
+SSE_SUBSCRIBER_QUEUE_SIZE = int(os.environ.get('SSE_SUBSCRIBER_QUEUE_SIZE', '16'))
+# Ticker deltas kept for Last-Event-ID resume
+TICKER_HISTORY_SIZE = 256
+# Distinguishes event ids issued by this process from those of a previous run
+STREAM_EPOCH = uuid.uuid4().hex[:8]
+
+def encode_event(data: dict, event_id: Optional[str] = None) -> bytes:
+    prefix = f"id: {event_id}\n" if event_id else ""
+    return f"{prefix}data: {json.dumps(data, default=str)}\n\n".encode()
+
+class TickerFeed:
+    """Versioned in-memory copy of the active tickers.
+
+    Every change becomes a ticker_delta event carrying the new version as its
+    SSE id, so reconnecting clients can resume from Last-Event-ID. Changes made
+    outside this process are picked up by diffing on reload, at most
+    TIMELINE_MAX_AGE_SECONDS after they happen.
+    """
+
+    def __init__(self, max_age: float = TIMELINE_MAX_AGE_SECONDS):
+        self.max_age = max_age
+        self.version = 0
+        self.items: dict = {}
+        self.history = deque(maxlen=TICKER_HISTORY_SIZE)
+        self.loaded_at: Optional[float] = None
+        self.lock = asyncio.Lock()
+        self.listeners: list = []
+
+    def event_id(self, version: int) -> str:
+        return f"{STREAM_EPOCH}-{version}"
+
+    async def sync(self):
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.max_age:
+            return
+        async with self.lock:
+            if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.max_age:
+                return
+            docs = await db.tickers.find({"active": True}, {"_id": 0}).to_list(None)
+            fresh = {}
+            for doc in docs:
+                ticker = Ticker(**doc).model_dump(mode="json")
+                fresh[ticker['id']] = ticker
+            if self.loaded_at is None:
+                self.items = fresh
+            else:
+                for ticker_id in list(self.items):
+                    if ticker_id not in fresh:
+                        self.apply("delete", {"id": ticker_id})
+                for ticker in fresh.values():
+                    self.apply("upsert", ticker)
+            self.loaded_at = time.monotonic()
+
+    def apply(self, op: str, item: dict):
+        """Record a ticker change; item is the JSON form of a Ticker (or just its id for deletes)"""
+        ticker_id = item['id']
+        if op == "upsert" and not item.get('active', True):
+            op = "delete"
+        if op == "upsert":
+            existing = self.items.get(ticker_id)
+            # created_at loses sub-millisecond precision in BSON; ignore it
+            if existing and all(existing.get(k) == item.get(k) for k in ("text", "priority", "active")):
+                return
+            self.items[ticker_id] = item
+        else:
+            if ticker_id not in self.items:
+                return
+            del self.items[ticker_id]
+            item = {"id": ticker_id}
+
+        self.version += 1
+        delta = {"type": "ticker_delta", "version": self.version, "op": op, "item": item}
+        payload = encode_event(delta, self.event_id(self.version))
+        self.history.append((self.version, payload))
+        for listener in self.listeners:
+            listener(payload)
+
+    def snapshot(self) -> bytes:
+        items = sorted(self.items.values(), key=lambda t: t['priority'])
+        data = {"type": "ticker", "version": self.version, "items": items}
+        return encode_event(data, self.event_id(self.version))
+
+    def catch_up(self, last_event_id: Optional[str], limit: int) -> List[bytes]:
+        """Events a client needs to be current, given the last id it saw"""
+        epoch, _, version = (last_event_id or "").partition("-")
+        if epoch == STREAM_EPOCH and version.isdigit():
+            seen = int(version)
+            if seen == self.version:
+                return []
+            missed = [payload for v, payload in self.history if v > seen]
+            oldest = self.history[0][0] if self.history else self.version + 1
+            if seen < self.version and oldest <= seen + 1 and len(missed) <= limit:
+                return missed
+        return [self.snapshot()]
+
+ticker_feed = TickerFeed()
+
+class BroadcastHub:
+    """Fans out per-channel SSE events to all connected clients.
+
+    One producer task per channel computes and encodes each now_playing event
+    once, waking exactly at the channel's next start/end boundary or when a
+    schedule write touches the channel. Ticker deltas are pushed to every
+    channel as they happen. Each subscriber reads the shared bytes through its
+    own bounded queue; a subscriber whose queue is full is disconnected instead
+    of stalling the producer.
+    """
+
+    def __init__(self, queue_size: int = SSE_SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscribers: dict = {}
+        self.producers: dict = {}
+        self.wakeups: dict = {}
+        self.latest: dict = {}
+        self.dropped = 0
+
+    async def subscribe(self, channel_id: str, last_event_id: Optional[str] = None) -> asyncio.Queue:
+        await ticker_feed.sync()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        # Replay the current state so new clients don't wait for a change
+        if channel_id in self.latest:
+            queue.put_nowait(self.latest[channel_id])
+        for payload in ticker_feed.catch_up(last_event_id, self.queue_size - 1):
+            queue.put_nowait(payload)
+        self.subscribers.setdefault(channel_id, set()).add(queue)
+        producer = self.producers.get(channel_id)
+        if producer is None or producer.done():
+            self.wakeups[channel_id] = asyncio.Event()
+            self.producers[channel_id] = asyncio.create_task(self.produce(channel_id))
+        return queue
+
+    def unsubscribe(self, channel_id: str, queue: asyncio.Queue):
+        queues = self.subscribers.get(channel_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self.subscribers[channel_id]
+            self.latest.pop(channel_id, None)
+            self.wakeups.pop(channel_id, None)
+            producer = self.producers.pop(channel_id, None)
+            if producer is not None:
+                producer.cancel()
+
+    def notify(self, channel_id: Optional[str]):
+        """Wake the producer of a channel (or all producers) to recompute now"""
+        if channel_id is None:
+            for wakeup in self.wakeups.values():
+                wakeup.set()
+        elif channel_id in self.wakeups:
+            self.wakeups[channel_id].set()
+
+    def publish(self, channel_id: str, payload: bytes):
+        for queue in list(self.subscribers.get(channel_id, ())):
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                self.drop(channel_id, queue)
+
+    def publish_all(self, payload: bytes):
+        for channel_id in list(self.subscribers):
+            self.publish(channel_id, payload)
+
+    def drop(self, channel_id: str, queue: asyncio.Queue):
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+        self.subscribers.get(channel_id, set()).discard(queue)
+        self.dropped += 1
+        logger.warning(f"Dropped slow SSE subscriber on channel {channel_id}")
+
+    def subscriber_count(self, channel_id: Optional[str] = None) -> int:
+        if channel_id is not None:
+            return len(self.subscribers.get(channel_id, ()))
+        return sum(len(queues) for queues in self.subscribers.values())
+
+    async def produce(self, channel_id: str):
+        wakeup = self.wakeups[channel_id]
+        last_key = None
+        while True:
+            wakeup.clear()
+            timeout = SSE_RETRY_SECONDS
+            try:
+                timeline = await timeline_index.get(channel_id)
+                now = datetime.now(timezone.utc)
+                current, _ = timeline.lookup(now)
+                key = (current.item.id, current.program.id if current.program else None) if current else None
+                if key != last_key:
+                    data = {
+                        "type": "now_playing",
+                        "program": current.program.model_dump(mode="json") if current and current.program else None,
+                        "schedule": current.item.model_dump(mode="json") if current else None
+                    }
+                    self.latest[channel_id] = encode_event(data)
+                    self.publish(channel_id, self.latest[channel_id])
+                    last_key = key
+
+                # Also covers changes from other processes to tickers and schedule
+                await ticker_feed.sync()
+                timeout = TIMELINE_MAX_AGE_SECONDS
+                boundary = timeline.next_boundary(now)
+                if boundary is not None:
+                    timeout = min(timeout, (boundary - now).total_seconds())
+
+            except Exception as e:
+                logger.error(f"Broadcast producer error: {e}")
+
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                pass
+
+broadcast_hub = BroadcastHub()
+timeline_index.listeners.append(broadcast_hub.notify)
+ticker_feed.listeners.append(broadcast_hub.publish_all)
+
+async def event_generator(channel_id: str, last_event_id: Optional[str] = None) -> AsyncGenerator[bytes, None]:
+    """Relay the channel's shared broadcast to one client"""
+    queue = await broadcast_hub.subscribe(channel_id, last_event_id)
+    try:
+        while True:
+            payload = await queue.get()
+            if payload is None:
+                break
+            yield payload
+    finally:
+        broadcast_hub.unsubscribe(channel_id, queue)
 
 @api_router.get("/stream/updates")
-async def stream_updates(channel_id: str):
+async def stream_updates(channel_id: str, last_event_id: Optional[str] = Header(None)):
     """Server-sent events endpoint for real-time updates"""
     return StreamingResponse(
-        event_generator(channel_id),
+        event_generator(channel_id, last_event_id),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -616,14 +2754,43 @@ async def stream_updates(channel_id: str):
         }
     )
 
+@api_router.get("/stream/stats")
+async def stream_stats():
+    """Connected SSE clients per channel"""
+    return {
+        "total": broadcast_hub.subscriber_count(),
+        "channels": {cid: len(queues) for cid, queues in broadcast_hub.subscribers.items()},
+        "dropped": broadcast_hub.dropped
+    }
+
 # ============ STARTUP EVENTS ============
 
+COLLECTIONS = ("users", "channels", "programs", "schedule_items", "schedule_rules", "tickers", "ads")
+
+async def ensure_indexes():
+    for name in COLLECTIONS:
+        await db[name].create_index("id", unique=True)
+    # Now-playing, conflict checks and schedule listing
+    await db.schedule_items.create_index([("channel_id", 1), ("start_time", 1)])
+    await db.schedule_items.create_index([("channel_id", 1), ("status", 1), ("start_time", 1)])
+    # Scheduler engine reload (all channels)
+    await db.schedule_items.create_index([("status", 1), ("start_time", 1)])
+    # EPG bucket loads (all channels, items still airing after a given time)
+    await db.schedule_items.create_index([("end_time", 1), ("start_time", 1)])
+    await db.schedule_rules.create_index("channel_id")
+    # Program listings per channel, keyset paginated on (created_at, id)
+    await db.programs.create_index([("channel_id", 1), ("created_at", 1)])
+
 @app.on_event("startup")
 async def startup_event():
+    await ensure_indexes()
+    
     # Start scheduler engine
-    asyncio.create_task(scheduler_engine())
+    asyncio.create_task(scheduler_engine.run())
     logger.info("Scheduler engine started")
     
+    asyncio.create_task(mining_news.run())
+    
     # Create default channel if none exists
     channel_count = await db.channels.count_documents({})
     if channel_count == 0:
@@ -634,7 +2801,6 @@ async def startup_event():
             default_embed_url="https://www.youtube.com/embed/live_stream?channel=UCYfdidRxbB8Qhf0Nx7ioOYw"
         )
         doc = default_channel.model_dump()
-        doc['created_at'] = doc['created_at'].isoformat()
         await db.channels.insert_one(doc)
         logger.info("Default channel created")
 
@@ -647,6 +2813,7 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 logging.basicConfig(
@@ -34,6 +34,7 @@ CREATE TABLE `programs` (
   `duration_seconds` int,
   `created_by` varchar(36),
   `created_at` datetime,
+  KEY `ix_programs_channel_created` (`channel_id`, `created_at`),
   FOREIGN KEY (`channel_id`) REFERENCES `channels` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
@@ -49,6 +50,9 @@ CREATE TABLE `schedule_items` (
   `status` varchar(50) DEFAULT 'scheduled',
   `created_at` datetime,
   `updated_at` datetime,
+  KEY `ix_schedule_items_channel_start` (`channel_id`, `start_time`),
+  KEY `ix_schedule_items_channel_status_start` (`channel_id`, `status`, `start_time`),
+  KEY `ix_schedule_items_end_start` (`end_time`, `start_time`),
   FOREIGN KEY (`program_id`) REFERENCES `programs` (`id`),
   FOREIGN KEY (`channel_id`) REFERENCES `channels` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -70,7 +74,7 @@ CREATE TABLE `users` (
   `name` varchar(255) NOT NULL,
   `email` varchar(255) UNIQUE NOT NULL,
   `password_hash` varchar(255) NOT NULL,
-  `role` varchar(50) DEFAULT 'editor',
+  `role` varchar(50) DEFAULT 'viewer',
   `created_at` datetime
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
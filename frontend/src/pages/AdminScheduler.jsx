@@ -61,10 +61,17 @@ export default function AdminScheduler() {
       return;
     }
     
+    axios.defaults.headers.common['Authorization'] = `Bearer ${token}`;
     setUser(JSON.parse(userData));
     loadData();
   }, []);
 
+  useEffect(() => {
+    if (selectedChannel && selectedDate) {
+      loadChannelData(selectedChannel.id, selectedDate);
+    }
+  }, [selectedDate]);
+
   const loadData = async () => {
     try {
       const [channelsRes, tickersRes] = await Promise.all([
@@ -85,15 +92,34 @@ export default function AdminScheduler() {
     }
   };
 
-  const loadChannelData = async (channelId) => {
+  // Follows X-Next-Cursor until the list endpoint has returned every page
+  const getAllPages = async (url, params) => {
+    const rows = [];
+    let cursor = null;
+    do {
+      const res = await axios.get(url, { params: cursor ? { ...params, cursor } : params });
+      rows.push(...res.data);
+      cursor = res.headers['x-next-cursor'];
+    } while (cursor);
+    return rows;
+  };
+
+  const loadChannelData = async (channelId, date = selectedDate) => {
     try {
-      const [programsRes, scheduleRes] = await Promise.all([
-        axios.get(`${API}/programs?channel_id=${channelId}`),
-        axios.get(`${API}/schedule?channel_id=${channelId}`)
+      // Only the selected day of the schedule, not its whole history
+      const dayStart = new Date(date.getFullYear(), date.getMonth(), date.getDate());
+      const dayEnd = new Date(date.getFullYear(), date.getMonth(), date.getDate() + 1);
+      const [programsList, scheduleList] = await Promise.all([
+        getAllPages(`${API}/programs`, { channel_id: channelId }),
+        getAllPages(`${API}/schedule`, {
+          channel_id: channelId,
+          from: dayStart.toISOString(),
+          to: dayEnd.toISOString()
+        })
       ]);
       
-      setPrograms(programsRes.data);
-      setScheduleItems(scheduleRes.data);
+      setPrograms(programsList);
+      setScheduleItems(scheduleList);
     } catch (error) {
       console.error('Error loading channel data:', error);
     }
@@ -210,7 +236,9 @@ export default function AdminScheduler() {
     }
   };
 
-  const handleLogout = () => {
+  const handleLogout = async () => {
+    await axios.post(`${API}/auth/logout`).catch(() => null);
+    delete axios.defaults.headers.common['Authorization'];
     localStorage.removeItem('token');
     localStorage.removeItem('user');
     navigate('/login');
@@ -29,7 +29,7 @@ export default function Login() {
       const endpoint = isLogin ? '/auth/login' : '/auth/register';
       const payload = isLogin 
         ? { email: formData.email, password: formData.password }
-        : { ...formData, role: 'admin' };
+        : formData;
 
       const response = await axios.post(`${API}${endpoint}`, payload);
       
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Timing of the schedule conflict index (IntervalTree in backend/server.py)
+against the naive overlap scan it replaces, for 1k, 10k and 100k
+back-to-back items. Correctness against the naive check is covered by
+tests/test_conflict_index.py.
+
+Usage:
+    python scripts/bench_conflict_index.py [--queries 200] [--seed 1]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from server import IntervalTree
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+def minutes(n):
+    return EPOCH + timedelta(minutes=n)
+
+def random_interval(rng, span):
+    start = rng.randrange(span)
+    return minutes(start), minutes(start + rng.randint(1, 240))
+
+def naive_overlapping(intervals, start, end):
+    return sorted((s, item_id) for item_id, (s, e) in intervals.items() if s < end and e > start)
+
+def timing(rng, size, queries):
+    tree = IntervalTree()
+    intervals = {}
+    for i in range(size):
+        start = minutes(i * 30)
+        intervals[f"i{i}"] = (start, start + timedelta(minutes=30))
+        tree.add(f"i{i}", *intervals[f"i{i}"])
+    windows = [random_interval(rng, size * 30) for _ in range(queries)]
+
+    started = time.perf_counter()
+    for start, end in windows:
+        tree.overlapping(start, end)
+    indexed = (time.perf_counter() - started) / queries
+
+    started = time.perf_counter()
+    for start, end in windows:
+        naive_overlapping(intervals, start, end)
+    naive = (time.perf_counter() - started) / queries
+    print(f"{size:>7} items: tree {indexed * 1e6:8.1f} µs/query, scan {naive * 1e6:10.1f} µs/query")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for size in (1000, 10000, 100000):
+        timing(rng, size, args.queries)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Login storm benchmark: measures now-playing latency while many logins run.
+With bcrypt on the password pool, now-playing p99 should stay flat.
+
+Usage: NZURI_EMAIL=... NZURI_PASSWORD=... python bench_login_storm.py [channel_id]
+"""
+
+import os
+import sys
+import time
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8001")
+API = f"{BACKEND_URL}/api"
+EMAIL = os.environ.get("NZURI_EMAIL", "admin@nzuritv.com")
+PASSWORD = os.environ.get("NZURI_PASSWORD", "")
+LOGIN_CONCURRENCY = int(os.environ.get("LOGIN_CONCURRENCY", "50"))
+DURATION_SECONDS = float(os.environ.get("DURATION_SECONDS", "10"))
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000 if ordered else 0.0
+
+def sample_now_playing(channel_id, stop):
+    """Poll now-playing until stop is set and return latencies in seconds"""
+    latencies = []
+    session = requests.Session()
+    while not stop.is_set():
+        started = time.perf_counter()
+        session.get(f"{API}/channels/{channel_id}/now-playing", timeout=10)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+def login_loop(stop, counts):
+    session = requests.Session()
+    while not stop.is_set():
+        response = session.post(f"{API}/auth/login", json={"email": EMAIL, "password": PASSWORD}, timeout=30)
+        counts[response.status_code] = counts.get(response.status_code, 0) + 1
+
+def run_phase(channel_id, logins):
+    stop = threading.Event()
+    counts = {}
+    with ThreadPoolExecutor(max_workers=logins + 1) as pool:
+        sampler = pool.submit(sample_now_playing, channel_id, stop)
+        for _ in range(logins):
+            pool.submit(login_loop, stop, counts)
+        time.sleep(DURATION_SECONDS)
+        stop.set()
+        latencies = sampler.result()
+    return latencies, counts
+
+def main():
+    channel_id = sys.argv[1] if len(sys.argv) > 1 else requests.get(f"{API}/channels").json()[0]["id"]
+
+    print(f"Baseline: now-playing for {DURATION_SECONDS}s with no logins")
+    baseline, _ = run_phase(channel_id, 0)
+    print(f"  requests={len(baseline)} p50={percentile(baseline, 0.5):.1f}ms p99={percentile(baseline, 0.99):.1f}ms")
+
+    print(f"Storm: {LOGIN_CONCURRENCY} concurrent login loops")
+    storm, counts = run_phase(channel_id, LOGIN_CONCURRENCY)
+    print(f"  requests={len(storm)} p50={percentile(storm, 0.5):.1f}ms p99={percentile(storm, 0.99):.1f}ms")
+    print(f"  login responses: {counts}")
+
+    print(f"Password pool: {requests.get(f'{API}/auth/metrics').json()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of list response serialization for GET /api/schedule:
+the response_model path (validate every row through List[ScheduleItem],
+dump to JSON-able dicts, json.dumps) against the fast path (shape_rows +
+FastJSONResponse/orjson). Prints per-item cost for 1k and 10k items.
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from pydantic import TypeAdapter
+from server import ScheduleItem, FastJSONResponse, shape_rows
+
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", "5"))
+
+def make_docs(count):
+    """Docs as Motor returns them: aware datetimes, no _id"""
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    now = datetime.now(timezone.utc)
+    return [{
+        "id": str(uuid.uuid4()),
+        "program_id": str(uuid.uuid4()),
+        "channel_id": "channel",
+        "start_time": start + timedelta(minutes=30 * i),
+        "end_time": start + timedelta(minutes=30 * (i + 1)),
+        "is_live": False,
+        "status": "scheduled",
+        "created_at": now,
+        "updated_at": now
+    } for i in range(count)]
+
+def validated_path(adapter, docs) -> bytes:
+    # What FastAPI does with response_model: validate, serialize, json.dumps
+    items = adapter.validate_python(docs)
+    return json.dumps(adapter.dump_python(items, mode="json")).encode()
+
+def fast_path(docs) -> bytes:
+    return FastJSONResponse(shape_rows(ScheduleItem, docs)).body
+
+def best_of(fn, *args):
+    best = None
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    adapter = TypeAdapter(List[ScheduleItem])
+    for count in (1000, 10000):
+        docs = make_docs(count)
+        assert json.loads(validated_path(adapter, docs)) == json.loads(fast_path(docs))
+        slow = best_of(validated_path, adapter, docs)
+        fast = best_of(fast_path, docs)
+        print(f"{count:>6} items: response_model {slow / count * 1e6:6.2f} us/item, "
+              f"fast path {fast / count * 1e6:6.2f} us/item ({slow / fast:.1f}x)")
+
+if __name__ == "__main__":
+    main()
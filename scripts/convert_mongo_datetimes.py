@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+One-shot converter from ISO string timestamps to native BSON datetimes.
+
+Older versions of backend/server.py stored start_time, end_time, created_at
+and updated_at as ISO strings. The backend now stores and queries native
+datetimes, so existing documents must be converted once. Safe to re-run:
+only fields that are still strings are touched.
+
+Usage:
+    python scripts/convert_mongo_datetimes.py            # convert
+    python scripts/convert_mongo_datetimes.py --dry-run  # count only
+"""
+
+import argparse
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+from pymongo import MongoClient, UpdateOne
+
+load_dotenv(Path(__file__).parent.parent / "backend" / ".env")
+
+DATETIME_FIELDS = {
+    "users": ["created_at"],
+    "channels": ["created_at"],
+    "programs": ["created_at"],
+    "schedule_items": ["start_time", "end_time", "created_at", "updated_at"],
+    "tickers": ["created_at"],
+    "ads": ["created_at"],
+}
+
+BATCH_SIZE = 1000
+
+def to_datetime(value):
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+def convert_collection(collection, fields, dry_run=False):
+    query = {"$or": [{field: {"$type": "string"}} for field in fields]}
+    if dry_run:
+        return collection.count_documents(query)
+
+    converted = 0
+    batch = []
+    for doc in collection.find(query, {field: 1 for field in fields}):
+        updates = {}
+        for field in fields:
+            if isinstance(doc.get(field), str):
+                try:
+                    updates[field] = to_datetime(doc[field])
+                except ValueError:
+                    print(f"⚠️  {collection.name} {doc['_id']}: unparseable {field}={doc[field]!r}")
+        if updates:
+            batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": updates}))
+        if len(batch) >= BATCH_SIZE:
+            converted += collection.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        converted += collection.bulk_write(batch, ordered=False).modified_count
+    return converted
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="only count documents that need converting")
+    args = parser.parse_args()
+
+    client = MongoClient(os.environ["MONGO_URL"])
+    db = client[os.environ["DB_NAME"]]
+
+    for name, fields in DATETIME_FIELDS.items():
+        count = convert_collection(db[name], fields, dry_run=args.dry_run)
+        verb = "need converting" if args.dry_run else "converted"
+        print(f"{name}: {count} documents {verb}")
+
+if __name__ == "__main__":
+    main()
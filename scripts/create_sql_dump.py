@@ -1,19 +1,76 @@
 #!/usr/bin/env python3
+"""
+Streaming MySQL dump of the Nzuri TV data.
+
+Reads every collection either from the JSON export (parsed incrementally,
+one document at a time) or straight from MongoDB (MONGO_URL/DB_NAME, cursor
+batches), and writes extended multi-row INSERT statements of --batch-size
+rows through a buffered writer, optionally gzip-compressed. Memory is
+bounded by one batch whatever the number of rows.
+
+Usage:
+    python scripts/create_sql_dump.py                        # from the JSON export
+    python scripts/create_sql_dump.py --mongo                # from MongoDB
+    python scripts/create_sql_dump.py --gzip --batch-size 2000
+    mysql -u user -p < /app/database_exports/nzuritv_mysql_dump.sql
+"""
+
+import argparse
+import gzip
+import io
 import json
-from datetime import datetime
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+EXPORT_DIR = Path("/app/database_exports")
+DEFAULT_INPUT = EXPORT_DIR / "nzuritv_data_export.json"
+DEFAULT_OUTPUT = EXPORT_DIR / "nzuritv_mysql_dump.sql"
+
+BATCH_SIZE = 1000
+# Cut a statement early past this size so imports stay under max_allowed_packet
+STATEMENT_BYTES_LIMIT = 1 << 20
+WRITE_BUFFER_BYTES = 1 << 20
+READ_CHUNK_CHARS = 1 << 16
+
+# Column order of every table in SCHEMA; collections without a table are skipped
+TABLES = {
+    "users": ["id", "name", "email", "password_hash", "role", "created_at"],
+    "channels": ["id", "name", "slug", "description", "default_embed_url", "created_at"],
+    "programs": ["id", "channel_id", "title", "description", "tags", "content_type", "youtube_link",
+                 "uploaded_media_path", "duration_seconds", "created_by", "created_at"],
+    "schedule_items": ["id", "program_id", "channel_id", "start_time", "end_time", "is_live", "status",
+                       "created_at", "updated_at"],
+    "tickers": ["id", "text", "priority", "active", "created_at"],
+    "ads": ["id", "title", "image_url", "click_url", "priority", "active", "created_at"],
+}
+
+DATETIME_COLUMNS = {"start_time", "end_time", "created_at", "updated_at"}
 
-# Load the exported data
-with open('/app/database_exports/nzuritv_data_export.json', 'r') as f:
-    data = json.load(f)
+# MySQL string literal escapes (the set mysql_real_escape_string handles)
+ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "'": "\\'",
+    '"': '\\"',
+    "\0": "\\0",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\x1a": "\\Z",
+})
 
-sql_dump = """-- Nzuri Digital TV Database Export
--- Date: 2025-10-25
+HEADER = """-- Nzuri Digital TV Database Export
+-- Date: {date}
 -- Database: nzuri_tv
 
 SET NAMES utf8mb4;
 SET FOREIGN_KEY_CHECKS = 0;
+SET UNIQUE_CHECKS = 0;
 
--- Create database
+"""
+
+SCHEMA = """-- Create database
 CREATE DATABASE IF NOT EXISTS `nzuri_tv` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
 USE `nzuri_tv`;
 
@@ -42,6 +99,7 @@ CREATE TABLE `programs` (
   `duration_seconds` int,
   `created_by` varchar(36),
   `created_at` datetime,
+  KEY `ix_programs_channel_created` (`channel_id`, `created_at`),
   FOREIGN KEY (`channel_id`) REFERENCES `channels` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
@@ -57,6 +115,9 @@ CREATE TABLE `schedule_items` (
   `status` varchar(50) DEFAULT 'scheduled',
   `created_at` datetime,
   `updated_at` datetime,
+  KEY `ix_schedule_items_channel_start` (`channel_id`, `start_time`),
+  KEY `ix_schedule_items_channel_status_start` (`channel_id`, `status`, `start_time`),
+  KEY `ix_schedule_items_end_start` (`end_time`, `start_time`),
   FOREIGN KEY (`program_id`) REFERENCES `programs` (`id`),
   FOREIGN KEY (`channel_id`) REFERENCES `channels` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -78,7 +139,7 @@ CREATE TABLE `users` (
   `name` varchar(255) NOT NULL,
   `email` varchar(255) UNIQUE NOT NULL,
   `password_hash` varchar(255) NOT NULL,
-  `role` varchar(50) DEFAULT 'editor',
+  `role` varchar(50) DEFAULT 'viewer',
   `created_at` datetime
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
@@ -94,55 +155,192 @@ CREATE TABLE `ads` (
   `created_at` datetime
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
--- Insert data
 """
 
-# Insert channels
-if data['channels']:
-    sql_dump += "\n-- Channels\n"
-    for ch in data['channels']:
-        sql_dump += f"INSERT INTO `channels` (`id`, `name`, `slug`, `description`, `created_at`) VALUES "
-        sql_dump += f"('{ch['id']}', '{ch['name']}', '{ch.get('slug', '')}', "
-        sql_dump += f"'{ch.get('description', '')}', '{ch.get('created_at', '')}');\n"
-
-# Insert programs
-if data['programs']:
-    sql_dump += "\n-- Programs\n"
-    for p in data['programs']:
-        desc = p.get('description', '').replace("'", "''")
-        sql_dump += f"INSERT INTO `programs` (`id`, `channel_id`, `title`, `description`, `tags`, `content_type`, `youtube_link`, `duration_seconds`, `created_by`, `created_at`) VALUES "
-        sql_dump += f"('{p['id']}', '{p['channel_id']}', '{p['title']}', '{desc}', "
-        sql_dump += f"'{p.get('tags', '')}', '{p.get('content_type', 'video')}', '{p.get('youtube_link', '')}', "
-        sql_dump += f"{p.get('duration_seconds', 1800)}, '{p.get('created_by', 'system')}', '{p.get('created_at', '')}');\n"
-
-# Insert tickers
-if data['tickers']:
-    sql_dump += "\n-- Tickers\n"
-    for t in data['tickers']:
-        text = t['text'].replace("'", "''")
-        sql_dump += f"INSERT INTO `tickers` (`id`, `text`, `priority`, `active`, `created_at`) VALUES "
-        sql_dump += f"('{t['id']}', '{text}', {t.get('priority', 5)}, {1 if t.get('active') else 0}, '{t.get('created_at', '')}');\n"
-
-# Insert schedule (first 20 items)
-if data['schedule_items']:
-    sql_dump += "\n-- Schedule Items (sample - first 20)\n"
-    for s in data['schedule_items'][:20]:
-        sql_dump += f"INSERT INTO `schedule_items` (`id`, `program_id`, `channel_id`, `start_time`, `end_time`, `is_live`, `status`, `created_at`, `updated_at`) VALUES "
-        sql_dump += f"('{s['id']}', '{s['program_id']}', '{s['channel_id']}', '{s['start_time']}', '{s['end_time']}', "
-        sql_dump += f"{1 if s.get('is_live') else 0}, '{s.get('status', 'scheduled')}', '{s.get('created_at', '')}', '{s.get('updated_at', '')}');\n"
-
-sql_dump += "\nSET FOREIGN_KEY_CHECKS = 1;\n"
-sql_dump += "\n-- Export complete!\n"
-sql_dump += f"-- Total: {len(data['channels'])} channels, {len(data['programs'])} programs, {len(data['schedule_items'])} schedules, {len(data['tickers'])} tickers\n"
-
-# Save SQL dump
-with open('/app/database_exports/nzuritv_mysql_dump.sql', 'w') as f:
-    f.write(sql_dump)
-
-print("✅ MySQL SQL dump created successfully!")
-print(f"   Location: /app/database_exports/nzuritv_mysql_dump.sql")
-print(f"\n📊 Summary:")
-print(f"   - Channels: {len(data['channels'])}")
-print(f"   - Programs: {len(data['programs'])}")
-print(f"   - Schedule Items: {len(data['schedule_items'])} (showing first 20 in SQL)")
-print(f"   - Tickers: {len(data['tickers'])}")
+FOOTER = """
+SET UNIQUE_CHECKS = 1;
+SET FOREIGN_KEY_CHECKS = 1;
+
+-- Export complete!
+-- Total: {totals}
+"""
+
+def mysql_datetime(value):
+    """Naive UTC DATETIME literal body; accepts datetimes and ISO strings"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(sep=" ")
+
+def sql_literal(value):
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, datetime):
+        return f"'{mysql_datetime(value)}'"
+    return "'" + str(value).translate(ESCAPES) + "'"
+
+def sql_row(columns, doc):
+    values = []
+    for column in columns:
+        value = doc.get(column)
+        if column in DATETIME_COLUMNS and value is not None:
+            values.append(f"'{mysql_datetime(value)}'")
+        else:
+            values.append(sql_literal(value))
+    return "(" + ", ".join(values) + ")"
+
+def iter_json_export(path):
+    """Yield (collection, doc) from {"name": [{...}, ...], ...} without loading the whole file"""
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buf, pos = "", 0
+
+        def fill():
+            nonlocal buf, pos
+            chunk = f.read(READ_CHUNK_CHARS)
+            buf, pos = buf[pos:] + chunk, 0
+            return bool(chunk)
+
+        def peek():
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buf) or not fill():
+                    return buf[pos:pos + 1]
+
+        def expect(chars):
+            nonlocal pos
+            char = peek()
+            if not char or char not in chars:
+                raise ValueError(f"{path}: expected one of {chars!r} at {char!r}")
+            pos += 1
+            return char
+
+        def value():
+            nonlocal pos
+            peek()
+            while True:
+                try:
+                    obj, pos = decoder.raw_decode(buf, pos)
+                    return obj
+                except json.JSONDecodeError:
+                    # Incomplete document at the end of the buffer: read more
+                    if not fill():
+                        raise
+
+        expect("{")
+        if peek() == "}":
+            return
+        while True:
+            name = value()
+            expect(":")
+            expect("[")
+            if peek() == "]":
+                pos += 1
+            else:
+                while True:
+                    yield name, value()
+                    if expect(",]") == "]":
+                        break
+            if expect(",}") == "}":
+                return
+
+def iter_mongo(batch_size):
+    """Yield (collection, doc) straight from MongoDB, one cursor batch in memory at a time"""
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+
+    load_dotenv(Path(__file__).parent.parent / "backend" / ".env")
+    client = MongoClient(os.environ["MONGO_URL"])
+    db = client[os.environ["DB_NAME"]]
+    try:
+        for name in TABLES:
+            for doc in db[name].find({}, {"_id": 0}, batch_size=batch_size):
+                yield name, doc
+    finally:
+        client.close()
+
+def open_output(path, compress):
+    raw = gzip.open(path, "wb", compresslevel=6) if compress else open(path, "wb")
+    return io.TextIOWrapper(io.BufferedWriter(raw, WRITE_BUFFER_BYTES), encoding="utf-8", newline="\n")
+
+class InsertWriter:
+    """Groups rows of one table into extended INSERT statements"""
+
+    def __init__(self, out, batch_size):
+        self.out = out
+        self.batch_size = batch_size
+        self.table = None
+        self.rows = []
+        self.size = 0
+        self.counts = {}
+        self.skipped = {}
+
+    def add(self, table, doc):
+        columns = TABLES.get(table)
+        if columns is None:
+            self.skipped[table] = self.skipped.get(table, 0) + 1
+            return
+        if table != self.table:
+            self.flush()
+            self.table = table
+            self.out.write(f"\n-- {table}\n")
+        row = sql_row(columns, doc)
+        self.rows.append(row)
+        self.size += len(row) + 2
+        self.counts[table] = self.counts.get(table, 0) + 1
+        if len(self.rows) >= self.batch_size or self.size >= STATEMENT_BYTES_LIMIT:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        column_list = ", ".join(f"`{column}`" for column in TABLES[self.table])
+        self.out.write(f"INSERT INTO `{self.table}` ({column_list}) VALUES\n")
+        self.out.write(",\n".join(self.rows))
+        self.out.write(";\n")
+        self.rows = []
+        self.size = 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", type=Path, default=DEFAULT_INPUT, help="JSON export to read")
+    parser.add_argument("--mongo", action="store_true", help="read from MongoDB instead of the JSON export")
+    parser.add_argument("--output", "-o", type=Path, help="SQL file to write (default: %s[.gz])" % DEFAULT_OUTPUT)
+    parser.add_argument("--gzip", action="store_true", help="gzip the output")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per INSERT statement")
+    args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be positive")
+
+    output = args.output or Path(str(DEFAULT_OUTPUT) + (".gz" if args.gzip else ""))
+    docs = iter_mongo(args.batch_size) if args.mongo else iter_json_export(args.input)
+
+    started = time.perf_counter()
+    with open_output(output, args.gzip) as out:
+        out.write(HEADER.format(date=datetime.now(timezone.utc).date().isoformat()))
+        out.write(SCHEMA)
+        writer = InsertWriter(out, args.batch_size)
+        for table, doc in docs:
+            writer.add(table, doc)
+        writer.flush()
+        totals = ", ".join(f"{writer.counts.get(table, 0)} {table}" for table in TABLES)
+        out.write(FOOTER.format(totals=totals))
+
+    print("✅ MySQL SQL dump created successfully!")
+    print(f"   Location: {output}")
+    print(f"   Took {time.perf_counter() - started:.1f}s")
+    print("\n📊 Summary:")
+    for table in TABLES:
+        print(f"   - {table}: {writer.counts.get(table, 0)}")
+    for table, count in writer.skipped.items():
+        print(f"   ⚠️  {table}: {count} documents skipped (no MySQL table)")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Copy data directly between the Mongo backend (server.py) and the MySQL
+backend (server_mysql.py), in either direction, without intermediate files.
+
+Each collection is read in id order in --batch-size batches (Motor cursors
+or a streamed SQLAlchemy Core select) and written with bulk inserts
+(SQLAlchemy Core executemany or Mongo bulk_write upserts). Collections run
+in parallel, --jobs at a time. Datetimes are converted in flight: naive UTC
+DATETIME columns on the MySQL side, aware UTC datetimes on the Mongo side.
+
+With --checkpoint the last id written per collection is saved after every
+batch; re-running with the same file resumes where the previous run
+stopped. Writes are idempotent (INSERT IGNORE / upsert by id), so a batch
+replayed after a crash does not duplicate rows.
+
+migrate() takes the Motor database and the async engine as arguments, so
+it runs against mongomock_motor and a sqlite+aiosqlite engine as well.
+
+Usage:
+    python scripts/migrate_databases.py mongo-to-mysql
+    python scripts/migrate_databases.py mysql-to-mongo --collections programs schedule_items
+    python scripts/migrate_databases.py mongo-to-mysql --checkpoint migrate.json --jobs 6
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from contextlib import aclosing
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from dotenv import load_dotenv
+from pymongo import ReplaceOne
+from sqlalchemy import DateTime, insert, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+load_dotenv(Path(__file__).parent.parent / "backend" / ".env")
+
+from server_mysql import Base, async_database_url
+
+DIRECTIONS = ("mongo-to-mysql", "mysql-to-mongo")
+BATCH_SIZE = 1000
+JOBS = 4
+
+# Every MySQL table, keyed by its Mongo collection name (they match)
+TABLES = {table.name: table for table in Base.metadata.sorted_tables}
+
+def to_naive_utc(value):
+    """DATETIME column value from an aware/naive datetime or an ISO string"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def to_row(table, doc):
+    """Mongo document -> insert params with exactly the table's columns"""
+    row = {}
+    for column in table.columns:
+        value = doc.get(column.name)
+        if value is not None and isinstance(column.type, DateTime):
+            value = to_naive_utc(value)
+        row[column.name] = value
+    return row
+
+def to_doc(row):
+    """MySQL row mapping -> Mongo document with aware UTC datetimes"""
+    doc = dict(row)
+    for key, value in doc.items():
+        if isinstance(value, datetime) and value.tzinfo is None:
+            doc[key] = value.replace(tzinfo=timezone.utc)
+    return doc
+
+class Checkpoint:
+    """Last id written per collection, persisted after every batch"""
+
+    def __init__(self, path, direction):
+        self.path = Path(path) if path else None
+        self.direction = direction
+        self.state = {}
+        if self.path and self.path.exists():
+            self.state = json.loads(self.path.read_text())
+
+    def get(self, name):
+        return self.state.get(self.direction, {}).get(name, {})
+
+    def update(self, name, **values):
+        self.state.setdefault(self.direction, {}).setdefault(name, {}).update(values)
+        if self.path:
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(self.state, indent=2))
+            os.replace(tmp, self.path)
+
+async def mongo_batches(collection, after_id, batch_size):
+    query = {"id": {"$gt": after_id}} if after_id else {}
+    cursor = collection.find(query, {"_id": 0}).sort("id", 1).batch_size(batch_size)
+    batch = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+async def mysql_batches(engine, table, after_id, batch_size):
+    query = select(table).order_by(table.c.id).execution_options(yield_per=batch_size)
+    if after_id:
+        query = query.where(table.c.id > after_id)
+    async with engine.connect() as conn:
+        result = await conn.stream(query)
+        async for partition in result.mappings().partitions(batch_size):
+            yield partition
+
+async def copy_to_mysql(mongo_db, engine, name, after_id, batch_size):
+    table = TABLES[name]
+    # Replayed batches after a resume hit existing primary keys: skip them
+    statement = insert(table).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite")
+    async with engine.connect() as conn:
+        if engine.dialect.name == "mysql":
+            # Collections load in parallel, so children may arrive before parents
+            await conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+        async for batch in mongo_batches(mongo_db[name], after_id, batch_size):
+            await conn.execute(statement, [to_row(table, doc) for doc in batch])
+            await conn.commit()
+            yield len(batch), batch[-1]["id"]
+
+async def copy_to_mongo(mongo_db, engine, name, after_id, batch_size):
+    collection = mongo_db[name]
+    await collection.create_index("id", unique=True)
+    async for batch in mysql_batches(engine, TABLES[name], after_id, batch_size):
+        docs = [to_doc(row) for row in batch]
+        await collection.bulk_write([ReplaceOne({"id": doc["id"]}, doc, upsert=True) for doc in docs], ordered=False)
+        yield len(docs), docs[-1]["id"]
+
+async def migrate_collection(direction, mongo_db, engine, name, batch_size, checkpoint, stop):
+    state = checkpoint.get(name)
+    if state.get("done"):
+        print(f"   {name}: already migrated ({state.get('rows', 0)} rows), skipping")
+        return 0, 0.0
+
+    copy = copy_to_mysql if direction == "mongo-to-mysql" else copy_to_mongo
+    rows = state.get("rows", 0)
+    copied = 0
+    started = time.perf_counter()
+    async with aclosing(copy(mongo_db, engine, name, state.get("last_id"), batch_size)) as batches:
+        async for count, last_id in batches:
+            copied += count
+            rows += count
+            checkpoint.update(name, last_id=last_id, rows=rows)
+            if stop.is_set():
+                print(f"   {name}: stopped after {rows} rows")
+                return copied, time.perf_counter() - started
+    elapsed = time.perf_counter() - started
+    checkpoint.update(name, rows=rows, done=True)
+    print(f"   {name}: {copied} rows in {elapsed:.1f}s ({copied / max(elapsed, 1e-9):,.0f} rows/s)")
+    return copied, elapsed
+
+async def migrate(direction, mongo_db, engine, collections=None, batch_size=BATCH_SIZE, jobs=JOBS, checkpoint=None):
+    """Copy the given collections (default: all MySQL tables); returns {name: rows copied}"""
+    names = list(collections or TABLES)
+    unknown = [name for name in names if name not in TABLES]
+    if unknown:
+        raise ValueError(f"No MySQL table for: {', '.join(unknown)}")
+    checkpoint = checkpoint or Checkpoint(None, direction)
+
+    if direction == "mongo-to-mysql":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    limit = asyncio.Semaphore(jobs)
+    # Set on the first failure: the other collections finish their current
+    # batch, checkpoint it and stop, so a resume picks up cleanly
+    stop = asyncio.Event()
+
+    async def run(name):
+        async with limit:
+            if stop.is_set():
+                return 0, 0.0
+            try:
+                return await migrate_collection(direction, mongo_db, engine, name, batch_size, checkpoint, stop)
+            except BaseException:
+                stop.set()
+                raise
+
+    results = await asyncio.gather(*(run(name) for name in names), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return {name: copied for name, (copied, _) in zip(names, results)}
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("direction", choices=DIRECTIONS)
+    parser.add_argument("--collections", nargs="+", choices=list(TABLES), help="default: all of them")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="documents per read and bulk write")
+    parser.add_argument("--jobs", type=int, default=JOBS, help="collections migrated in parallel")
+    parser.add_argument("--checkpoint", help="JSON file to record progress in and resume from")
+    parser.add_argument("--mysql-url", default=os.environ.get("MYSQL_URL"), help="default: $MYSQL_URL")
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL"), help="default: $MONGO_URL")
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME"), help="default: $DB_NAME")
+    args = parser.parse_args()
+    if not (args.mysql_url and args.mongo_url and args.db_name):
+        parser.error("MYSQL_URL, MONGO_URL and DB_NAME (or the matching options) are required")
+    if args.batch_size < 1 or args.jobs < 1:
+        parser.error("--batch-size and --jobs must be positive")
+
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(args.mongo_url, tz_aware=True)
+    engine = create_async_engine(async_database_url(args.mysql_url), pool_size=args.jobs, pool_pre_ping=True)
+    print(f"🚚 {args.direction} ({args.batch_size} per batch, {args.jobs} jobs)")
+    started = time.perf_counter()
+    try:
+        copied = await migrate(args.direction, client[args.db_name], engine, args.collections,
+                               args.batch_size, args.jobs, Checkpoint(args.checkpoint, args.direction))
+    finally:
+        await engine.dispose()
+        client.close()
+    elapsed = time.perf_counter() - started
+    total = sum(copied.values())
+    print(f"✅ {total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Idempotent schedule seeding against the Nzuri TV API.
+
+Reads a seed file (see scripts/seeds/) naming a channel, its programs and a
+grid, diffs it against what the API already holds and applies only the
+difference: missing programs and slots are created. Running the same seed
+twice makes no changes the second time. Slots that have already ended are
+left alone.
+
+The seed owns only the programs whose titles it lists. Deletes are applied
+only with --prune: future slots of those programs that the grid no longer
+has, and programs whose fields differ from the seed (replaced, which deletes
+their schedule items, past airings included). Without it they are listed and
+skipped; run with --dry-run --prune to review them first. Other programs on
+the channel and their slots are never touched.
+
+Requests go out concurrently over one pooled HTTP/2 client. Programs are
+deleted with one cascading DELETE /api/programs and slots are created
+through POST /api/schedule/bulk.
+
+Grids:
+    daily     "slots": [{"start": "06:00", "program": "<title>", "duration_minutes": 180}, ...]
+              every day in UTC; duration defaults to the program's duration_seconds
+    rotation  "slot_minutes": 30, "anchor": "<ISO datetime>", optional "programs": [titles]
+              round-robin counted from the anchor, so a re-run lands on the same slots
+
+Usage:
+    NZURI_TOKEN=... python scripts/seed_schedule.py scripts/seeds/daily_grid.json
+    python scripts/seed_schedule.py scripts/seeds/rotation_mix.json --dry-run
+    NZURI_TOKEN=... python scripts/seed_schedule.py scripts/seeds/rotation_mix.json --prune
+    python scripts/seed_schedule.py seed.json --api https://example.com/api --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+API = os.environ.get("NZURI_API", "http://localhost:8001/api")
+CONCURRENCY = 16
+# Slots per POST /api/schedule/bulk request
+BULK_CHUNK = 500
+PROGRAM_FIELDS = ("description", "tags", "content_type", "youtube_link", "duration_seconds")
+SCHEDULE_FIELDS = "id,program_id,start_time,end_time,is_live"
+
+def parse_time(value):
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+def load_seed(path):
+    with open(path, encoding="utf-8") as f:
+        seed = json.load(f)
+    titles = [p["title"] for p in seed["programs"]]
+    if len(set(titles)) != len(titles):
+        raise ValueError(f"{path}: program titles must be unique")
+    return seed
+
+def grid_slots(seed, window_start, window_end):
+    """Desired (title, start, end, is_live) tuples in [window_start, window_end)"""
+    grid = seed["grid"]
+    programs = {p["title"]: p for p in seed["programs"]}
+    is_live = grid.get("is_live", False)
+    slots = []
+    if grid["kind"] == "daily":
+        day = window_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day < window_end:
+            for slot in grid["slots"]:
+                hours, minutes = map(int, slot["start"].split(":"))
+                start = day + timedelta(hours=hours, minutes=minutes)
+                if "duration_minutes" in slot:
+                    length = timedelta(minutes=slot["duration_minutes"])
+                else:
+                    length = timedelta(seconds=programs[slot["program"]]["duration_seconds"])
+                if window_start <= start < window_end:
+                    slots.append((slot["program"], start, start + length, is_live))
+            day += timedelta(days=1)
+    elif grid["kind"] == "rotation":
+        titles = grid.get("programs") or list(programs)
+        length = timedelta(minutes=grid["slot_minutes"])
+        anchor = parse_time(grid["anchor"])
+        index = -((anchor - window_start) // length)  # first slot starting at or after window_start
+        start = anchor + index * length
+        while start < window_end:
+            slots.append((titles[index % len(titles)], start, start + length, is_live))
+            index += 1
+            start += length
+    else:
+        raise ValueError(f"Unknown grid kind: {grid['kind']}")
+    unknown = {title for title, *_ in slots} - set(programs)
+    if unknown:
+        raise ValueError(f"Grid names programs not in the seed: {', '.join(sorted(unknown))}")
+    return sorted(slots, key=lambda slot: slot[1])
+
+class Seeder:
+    """Pooled client with a concurrency cap, request counts and phase timings"""
+
+    def __init__(self, client, concurrency):
+        self.client = client
+        self.limit = asyncio.Semaphore(concurrency)
+        self.requests = 0
+        self.timings = []
+
+    async def call(self, method, url, **kwargs):
+        async with self.limit:
+            self.requests += 1
+            response = await self.client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def get_all(self, url, params):
+        """Follow X-Next-Cursor until the list is exhausted"""
+        rows = []
+        params = dict(params)
+        while True:
+            response = await self.call("GET", url, params=params)
+            rows += response.json()
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return rows
+            params["cursor"] = cursor
+
+    async def phase(self, name, coro):
+        started, requests = time.perf_counter(), self.requests
+        result = await coro
+        self.timings.append((name, time.perf_counter() - started, self.requests - requests))
+        return result
+
+async def get_schedule(seeder, params):
+    """Stored items and rule occurrences of the window, with rule_id where the server has it"""
+    try:
+        return await seeder.get_all("/schedule", {**params, "fields": SCHEDULE_FIELDS + ",rule_id"})
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 400:
+            raise
+    # The MySQL backend has no recurrence rules and no rule_id: every item is stored
+    return await seeder.get_all("/schedule", {**params, "fields": SCHEDULE_FIELDS})
+
+async def ensure_channel(seeder, seed, dry_run):
+    spec = seed["channel"]
+    channels = (await seeder.call("GET", "/channels")).json()
+    for channel in channels:
+        if channel["slug"] == spec["slug"]:
+            return channel["id"]
+    if dry_run:
+        print(f"   + channel {spec['slug']}")
+        return None
+    return (await seeder.call("POST", "/channels", json=spec)).json()["id"]
+
+def plan(seed, programs, items, window_start, window_end, now, prune=False):
+    """Diff the seed against the current state -> (program creates, program deletes, slot deletes, slot creates)
+
+    The seed owns the programs whose titles it lists and their future slots;
+    nothing else on the channel is ever a delete. Without prune a program
+    that differs from the seed is kept as it is rather than replaced, since
+    replacing it deletes its schedule items, past airings included.
+    """
+    wanted = {p["title"]: p for p in seed["programs"]}
+    keep = {}
+    program_deletes = []
+    for program in programs:
+        spec = wanted.get(program["title"])
+        if spec is None:
+            continue  # not the seed's
+        same = all(program.get(field) == spec.get(field) for field in PROGRAM_FIELDS)
+        if (same or not prune) and program["title"] not in keep:
+            keep[program["title"]] = program["id"]
+        else:
+            program_deletes.append(program)
+    program_creates = [spec for title, spec in wanted.items() if title not in keep]
+
+    deleted_ids = {p["id"] for p in program_deletes}
+    titles = {program_id: title for title, program_id in keep.items()}
+    desired = {slot for slot in grid_slots(seed, window_start, window_end) if slot[2] > now}
+    slot_deletes = []
+    for item in items:
+        if item.get("rule_id") or item["program_id"] in deleted_ids:
+            continue  # rule occurrences are not stored; cascaded items go with their program
+        if item["program_id"] not in titles:
+            continue  # another program's slot
+        end = parse_time(item["end_time"])
+        if end <= now:
+            continue
+        key = (titles.get(item["program_id"]), parse_time(item["start_time"]), end, item["is_live"])
+        if key in desired:
+            desired.discard(key)
+        else:
+            slot_deletes.append(item)
+    return program_creates, program_deletes, slot_deletes, sorted(desired, key=lambda slot: slot[1])
+
+async def seed_channel(seeder, seed, dry_run=False, now=None, prune=False):
+    """Bring the channel in line with the seed; returns the counts of each change.
+
+    Deletes are only applied with prune; otherwise they are reported and skipped.
+    """
+    now = now or datetime.now(timezone.utc)
+    window_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    window_end = window_start + timedelta(days=seed.get("days", 7))
+
+    channel_id = await seeder.phase("channel", ensure_channel(seeder, seed, dry_run))
+    programs, items = [], []
+    if channel_id:
+        programs, items = await seeder.phase("fetch", asyncio.gather(
+            seeder.get_all("/programs", {"channel_id": channel_id}),
+            get_schedule(seeder, {"channel_id": channel_id, "from": window_start.isoformat(),
+                                  "to": window_end.isoformat()})
+        ))
+    program_creates, program_deletes, slot_deletes, slot_creates = plan(
+        seed, programs, items, window_start, window_end, now, prune)
+    counts = {
+        "programs_created": len(program_creates), "programs_deleted": len(program_deletes),
+        "slots_deleted": len(slot_deletes), "slots_created": len(slot_creates)
+    }
+    # Deletes a run without --prune leaves alone, listed so they can be reviewed first
+    skipped = "" if prune else " (skipped, needs --prune)"
+    if dry_run or not prune:
+        for program in program_deletes:
+            print(f"   - program {program['title']} and all its schedule items{skipped}")
+        for item in slot_deletes:
+            print(f"   - slot {item['start_time']} {item['program_id']}{skipped}")
+    if not prune:
+        # plan() kept these as they are instead of replacing them
+        wanted = {spec["title"]: spec for spec in seed["programs"]}
+        differing = [program for program in programs if program["title"] in wanted and program not in program_deletes
+                     and any(program.get(field) != wanted[program["title"]].get(field) for field in PROGRAM_FIELDS)]
+        for program in differing:
+            print(f"   ~ program {program['title']} differs from the seed{skipped}")
+        counts["programs_deleted"] = counts["slots_deleted"] = 0
+        counts["deletes_skipped"] = len(differing) + len(program_deletes) + len(slot_deletes)
+        program_deletes, slot_deletes = [], []
+    if dry_run:
+        for program in program_creates:
+            print(f"   + program {program['title']}")
+        for title, start, end, _ in slot_creates:
+            print(f"   + slot {start.isoformat()} - {end.isoformat()} {title}")
+        return counts
+
+    async def create_program(spec):
+        payload = {"channel_id": channel_id, **{key: spec.get(key) for key in ("title",) + PROGRAM_FIELDS}}
+        return spec["title"], (await seeder.call("POST", "/programs", json=payload)).json()["id"]
+
+    async def delete_programs():
+        if program_deletes:
+            await seeder.call("DELETE", "/programs", json={"ids": [p["id"] for p in program_deletes]})
+
+    async def delete_slots():
+        await asyncio.gather(*(seeder.call("DELETE", f"/schedule/{item['id']}") for item in slot_deletes))
+
+    # Deletes first so freed slots don't conflict with the creates
+    await seeder.phase("delete", asyncio.gather(delete_programs(), delete_slots()))
+    created = await seeder.phase("programs", asyncio.gather(*(create_program(spec) for spec in program_creates)))
+    ids = {}
+    for program in programs:
+        if program not in program_deletes:
+            ids.setdefault(program["title"], program["id"])
+    ids.update(created)
+
+    async def create_chunk(chunk):
+        payload = {"items": [{
+            "program_id": ids[title], "channel_id": channel_id,
+            "start_time": start.isoformat(), "end_time": end.isoformat(), "is_live": is_live
+        } for title, start, end, is_live in chunk]}
+        return (await seeder.call("POST", "/schedule/bulk", json=payload)).json()
+
+    chunks = [slot_creates[i:i + BULK_CHUNK] for i in range(0, len(slot_creates), BULK_CHUNK)]
+    results = await seeder.phase("schedule", asyncio.gather(*(create_chunk(chunk) for chunk in chunks)))
+    counts["slots_created"] = sum(result["created"] for result in results)
+    for result in results:
+        for failure in result["results"]:
+            if failure["status"] != "created":
+                print(f"❌ slot {failure['index'] + 1}: {failure['status']} {failure.get('detail') or ''}")
+    return counts
+
+def make_client(api, token, concurrency, transport=None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    return httpx.AsyncClient(base_url=api, headers=headers, limits=limits, http2=transport is None,
+                             transport=transport, timeout=30)
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("seed", help="seed file (JSON)")
+    parser.add_argument("--api", default=API, help="API base URL (default: $NZURI_API or %(default)s)")
+    parser.add_argument("--token", default=os.environ.get("NZURI_TOKEN"), help="editor token (default: $NZURI_TOKEN)")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="requests in flight")
+    parser.add_argument("--dry-run", action="store_true", help="print the diff without applying it")
+    parser.add_argument("--prune", action="store_true",
+                        help="also delete stale slots of the seed's programs, and replace programs that "
+                             "differ from the seed (deleting all their schedule items, past ones included)")
+    args = parser.parse_args()
+    if not args.token and not args.dry_run:
+        parser.error("an editor token is required: set NZURI_TOKEN or pass --token")
+
+    seed = load_seed(args.seed)
+    print(f"🌱 Seeding {seed['channel']['slug']} from {args.seed}{' (dry run)' if args.dry_run else ''}")
+    started = time.perf_counter()
+    async with make_client(args.api, args.token, args.concurrency) as client:
+        seeder = Seeder(client, args.concurrency)
+        try:
+            counts = await seed_channel(seeder, seed, dry_run=args.dry_run, prune=args.prune)
+        except httpx.HTTPStatusError as e:
+            print(f"❌ {e.request.method} {e.request.url}: {e.response.status_code} {e.response.text}")
+            sys.exit(1)
+
+    print("\n📊 Changes:" if not args.dry_run else "\n📊 Planned changes:")
+    for name, count in counts.items():
+        print(f"   - {name.replace('_', ' ')}: {count}")
+    print("\n⏱️  Timing:")
+    for name, elapsed, requests in seeder.timings:
+        print(f"   - {name}: {elapsed:.2f}s ({requests} requests)")
+    print(f"   Total: {time.perf_counter() - started:.2f}s, {seeder.requests} requests")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,19 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+# Captured before server.py loads backend/.env, which always sets MONGO_URL
+LIVE_MONGO_URL = os.environ.get("MONGO_URL")
+
+@pytest.fixture(scope="session")
+def live_mongo_url():
+    """MONGO_URL from the caller's environment; tests needing a real MongoDB skip without it"""
+    if not LIVE_MONGO_URL:
+        pytest.skip("MONGO_URL not set")
+    return LIVE_MONGO_URL
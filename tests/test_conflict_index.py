@@ -0,0 +1,65 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from server import IntervalTree
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+def minutes(n):
+    return EPOCH + timedelta(minutes=n)
+
+def random_interval(rng, span):
+    start = rng.randrange(span)
+    return minutes(start), minutes(start + rng.randint(1, 240))
+
+def naive_overlapping(intervals, start, end):
+    return sorted((s, item_id) for item_id, (s, e) in intervals.items() if s < end and e > start)
+
+def check_invariants(node, low=None, high=None):
+    """Return the subtree's max end, asserting order, heap and augmentation"""
+    if node is None:
+        return None
+    key = node.key()
+    assert low is None or low < key, "key order"
+    assert high is None or key < high, "key order"
+    for child in (node.left, node.right):
+        assert child is None or child.priority <= node.priority, "heap order"
+    ends = [node.end] + [e for e in (check_invariants(node.left, low, key),
+                                     check_invariants(node.right, key, high)) if e is not None]
+    assert node.max_end == max(ends), "max_end"
+    return node.max_end
+
+def run_round(rng, ops, span):
+    """Random adds, moves and removes, each followed by a query checked against a linear scan"""
+    tree = IntervalTree()
+    intervals = {}
+    for op in range(ops):
+        roll = rng.random()
+        if intervals and roll < 0.25:
+            item_id = rng.choice(list(intervals))
+            tree.remove(item_id)
+            del intervals[item_id]
+        elif intervals and roll < 0.4:
+            # A move: same id, new times
+            item_id = rng.choice(list(intervals))
+            intervals[item_id] = random_interval(rng, span)
+            tree.add(item_id, *intervals[item_id])
+        else:
+            item_id = f"i{op}"
+            intervals[item_id] = random_interval(rng, span)
+            tree.add(item_id, *intervals[item_id])
+
+        start, end = random_interval(rng, span)
+        got = [(node.start, node.item_id) for node in tree.overlapping(start, end)]
+        assert got == naive_overlapping(intervals, start, end), f"overlapping({start}, {end})"
+    assert len(tree) == len(intervals)
+    check_invariants(tree.root)
+
+# Narrow spans force dense overlaps, wide ones sparse trees
+@pytest.mark.parametrize("span", [60, 600, 60000])
+def test_matches_naive_overlap_check(span):
+    rng = random.Random(span)
+    for _ in range(60):
+        run_round(rng, 500, span)
@@ -0,0 +1,163 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import migrate_databases
+from migrate_databases import TABLES, Checkpoint, migrate
+
+COLLECTIONS = ["channels", "programs", "schedule_items"]
+START = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+def make_docs():
+    channels = [{"id": f"ch-{c}", "name": f"Channel {c}", "slug": f"channel-{c}", "created_at": START}
+                for c in range(3)]
+    programs = [{"id": f"pr-{p:03d}", "channel_id": f"ch-{p % 3}", "title": f"Program {p}",
+                 "content_type": "video", "created_by": "seed", "created_at": START}
+                for p in range(12)]
+    items = [{"id": f"si-{i:04d}", "program_id": f"pr-{i % 12:03d}", "channel_id": f"ch-{i % 3}",
+              "start_time": START + timedelta(minutes=30 * i), "end_time": START + timedelta(minutes=30 * (i + 1)),
+              "is_live": i % 7 == 0, "status": "scheduled", "created_at": START, "updated_at": START}
+             for i in range(250)]
+    # Left over from before the datetime conversion (user-005): ISO strings
+    items[0]["start_time"] = "2026-10-18T00:00:00Z"
+    items[0]["end_time"] = "2026-10-18T00:30:00+00:00"
+    return {"channels": channels, "programs": programs, "schedule_items": items}
+
+async def seed_mongo(docs):
+    db = AsyncMongoMockClient(tz_aware=True)["nzuri"]
+    for name, batch in docs.items():
+        await db[name].insert_many([dict(doc) for doc in batch])
+    return db
+
+async def mysql_counts(engine):
+    async with engine.connect() as conn:
+        return {name: await conn.scalar(select(func.count()).select_from(TABLES[name])) for name in COLLECTIONS}
+
+async def mysql_rows(engine, name):
+    async with engine.connect() as conn:
+        return {row["id"]: row for row in (await conn.execute(select(TABLES[name]))).mappings()}
+
+async def mongo_counts(db):
+    return {name: await db[name].count_documents({}) for name in COLLECTIONS}
+
+@pytest.fixture
+def engine_url(tmp_path):
+    return f"sqlite+aiosqlite:///{tmp_path / 'nzuri.db'}"
+
+def test_round_trip_converts_datetimes(engine_url):
+    docs = make_docs()
+
+    async def run():
+        engine = create_async_engine(engine_url)
+        try:
+            source = await seed_mongo(docs)
+            copied = await migrate("mongo-to-mysql", source, engine, COLLECTIONS, batch_size=40, jobs=3)
+            assert copied == {name: len(batch) for name, batch in docs.items()}
+            assert await mysql_counts(engine) == copied
+
+            items = await mysql_rows(engine, "schedule_items")
+            for doc in docs["schedule_items"][1:]:
+                row = items[doc["id"]]
+                assert row["start_time"].tzinfo is None
+                assert row["start_time"] == doc["start_time"].replace(tzinfo=None)
+            assert items["si-0000"]["start_time"] == datetime(2026, 10, 18)
+            assert items["si-0000"]["end_time"] == datetime(2026, 10, 18, 0, 30)
+
+            target = AsyncMongoMockClient(tz_aware=True)["nzuri_copy"]
+            copied_back = await migrate("mysql-to-mongo", target, engine, COLLECTIONS, batch_size=40, jobs=3)
+            assert copied_back == copied
+            assert await mongo_counts(target) == copied
+
+            doc = await target.schedule_items.find_one({"id": "si-0005"}, {"_id": 0})
+            assert doc["start_time"] == START + timedelta(minutes=150)
+            assert doc["start_time"].tzinfo is not None
+            assert doc["is_live"] is False
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+def test_interrupted_run_resumes_without_duplicates(engine_url, tmp_path, monkeypatch):
+    docs = make_docs()
+    path = tmp_path / "checkpoint.json"
+    to_row = migrate_databases.to_row
+    calls = {"n": 0}
+
+    def failing_to_row(table, doc):
+        calls["n"] += 1
+        if table.name == "schedule_items" and calls["n"] > 150:
+            raise ConnectionError("lost connection to MySQL server")
+        return to_row(table, doc)
+
+    async def run():
+        engine = create_async_engine(engine_url)
+        try:
+            source = await seed_mongo(docs)
+            monkeypatch.setattr(migrate_databases, "to_row", failing_to_row)
+            with pytest.raises(ConnectionError):
+                await migrate("mongo-to-mysql", source, engine, COLLECTIONS, batch_size=40, jobs=1,
+                              checkpoint=Checkpoint(path, "mongo-to-mysql"))
+            monkeypatch.setattr(migrate_databases, "to_row", to_row)
+
+            state = json.loads(path.read_text())["mongo-to-mysql"]
+            assert state["channels"]["done"] and state["programs"]["done"]
+            assert not state["schedule_items"].get("done")
+            partial = (await mysql_counts(engine))["schedule_items"]
+            assert 0 < partial < len(docs["schedule_items"])
+            assert partial == state["schedule_items"]["rows"]
+
+            # A crash between the write and the checkpoint replays a batch
+            state["schedule_items"]["last_id"] = "si-0010"
+            path.write_text(json.dumps({"mongo-to-mysql": state}))
+
+            copied = await migrate("mongo-to-mysql", source, engine, COLLECTIONS, batch_size=40, jobs=1,
+                                   checkpoint=Checkpoint(path, "mongo-to-mysql"))
+            assert copied["channels"] == copied["programs"] == 0
+            assert await mysql_counts(engine) == {name: len(batch) for name, batch in docs.items()}
+            assert json.loads(path.read_text())["mongo-to-mysql"]["schedule_items"]["done"]
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+def test_interrupted_copy_to_mongo_resumes_without_duplicates(engine_url, tmp_path, monkeypatch):
+    docs = make_docs()
+    path = tmp_path / "checkpoint.json"
+    to_doc = migrate_databases.to_doc
+    calls = {"n": 0}
+
+    def failing_to_doc(row):
+        calls["n"] += 1
+        if calls["n"] > 100:
+            raise ConnectionError("lost connection to MongoDB")
+        return to_doc(row)
+
+    async def run():
+        engine = create_async_engine(engine_url)
+        try:
+            await migrate("mongo-to-mysql", await seed_mongo(docs), engine, COLLECTIONS, batch_size=40)
+            target = AsyncMongoMockClient(tz_aware=True)["nzuri_copy"]
+            monkeypatch.setattr(migrate_databases, "to_doc", failing_to_doc)
+            with pytest.raises(ConnectionError):
+                await migrate("mysql-to-mongo", target, engine, ["schedule_items"], batch_size=40,
+                              checkpoint=Checkpoint(path, "mysql-to-mongo"))
+            monkeypatch.setattr(migrate_databases, "to_doc", to_doc)
+            assert 0 < await target.schedule_items.count_documents({}) < len(docs["schedule_items"])
+
+            state = json.loads(path.read_text())
+            state["mysql-to-mongo"]["schedule_items"]["last_id"] = "si-0010"
+            path.write_text(json.dumps(state))
+
+            await migrate("mysql-to-mongo", target, engine, ["schedule_items"], batch_size=40,
+                          checkpoint=Checkpoint(path, "mysql-to-mongo"))
+            ids = await target.schedule_items.distinct("id")
+            assert await target.schedule_items.count_documents({}) == len(ids) == len(docs["schedule_items"])
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,88 @@
+"""explain() of the hot schedule queries against the indexes server.py creates.
+
+Needs a real MongoDB (mongomock has no query planner): runs only when
+MONGO_URL is set in the environment, in a scratch database dropped afterwards.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
+
+import server
+
+NOW = datetime.now(timezone.utc)
+LATER = NOW + timedelta(hours=1)
+
+# (query, sort) as issued by the routes and background tasks
+QUERIES = {
+    "now-playing": ({
+        "channel_id": "x",
+        "start_time": {"$lte": NOW},
+        "end_time": {"$gt": NOW},
+        "status": {"$in": ["scheduled", "running"]},
+    }, [("start_time", 1)]),
+    "conflict check": ({
+        "channel_id": "x",
+        "status": {"$in": ["scheduled", "running"]},
+        "start_time": {"$lt": LATER},
+        "end_time": {"$gt": NOW},
+    }, [("start_time", 1)]),
+    "schedule listing": ({"channel_id": "x", "start_time": {"$gte": NOW}}, [("start_time", 1), ("id", 1)]),
+    "epg bucket": ({"end_time": {"$gt": NOW}, "start_time": {"$lt": LATER}}, [("start_time", 1), ("id", 1)]),
+    "scheduler reload": ({
+        "start_time": {"$lt": LATER},
+        "$or": [
+            {"status": "scheduled", "end_time": {"$gt": NOW}},
+            {"status": "running"}
+        ]
+    }, None),
+}
+
+def winning_stages(plan):
+    """Flatten the stage names of an explain() winning plan"""
+    stages = [plan.get("stage")]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages += winning_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages += winning_stages(child)
+    return [stage for stage in stages if stage]
+
+@pytest.fixture(scope="module")
+def indexed_db(live_mongo_url):
+    name = f"nzuri_index_test_{uuid.uuid4().hex[:8]}"
+
+    async def create():
+        client = AsyncIOMotorClient(live_mongo_url, tz_aware=True)
+        saved, server.db = server.db, client[name]
+        try:
+            await server.ensure_indexes()
+        finally:
+            server.db = saved
+            client.close()
+
+    asyncio.run(create())
+    client = MongoClient(live_mongo_url, tz_aware=True)
+    db = client[name]
+    db.schedule_items.insert_many([{
+        "id": str(uuid.uuid4()),
+        "channel_id": f"ch{i % 4}",
+        "status": ("scheduled", "running", "completed")[i % 3],
+        "start_time": NOW + timedelta(minutes=30 * (i - 100)),
+        "end_time": NOW + timedelta(minutes=30 * (i - 99)),
+    } for i in range(200)])
+    yield db
+    client.drop_database(name)
+    client.close()
+
+@pytest.mark.parametrize("name", list(QUERIES))
+def test_hot_query_uses_an_index(indexed_db, name):
+    query, sort = QUERIES[name]
+    cursor = indexed_db.schedule_items.find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    stages = winning_stages(cursor.explain()["queryPlanner"]["winningPlan"])
+    assert "IXSCAN" in stages and "COLLSCAN" not in stages, f"{name}: {' <- '.join(stages)}"
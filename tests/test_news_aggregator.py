@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import server
+import server_mysql
+
+RSS = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Stub mining news</title>{items}</channel></rss>"""
+
+class StubFeed:
+    """What the stub server answers with, and the requests it saw"""
+
+    def __init__(self):
+        self.etag = '"v1"'
+        self.titles = ["Gold output up", "New lithium mine"]
+        self.status = 200
+        self.delay = 0.0
+        self.requests = []
+
+    def body(self):
+        items = "".join(f"<item><title>{title}</title><link>https://example.com/{n}</link></item>"
+                        for n, title in enumerate(self.titles))
+        return RSS.format(items=items).encode()
+
+@pytest.fixture
+def feed():
+    stub = StubFeed()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            stub.requests.append(dict(self.headers))
+            time.sleep(stub.delay)
+            if stub.status != 200:
+                self.send_error(stub.status)
+            elif self.headers.get("If-None-Match") == stub.etag:
+                self.send_response(304)
+                self.end_headers()
+            else:
+                body = stub.body()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml")
+                self.send_header("ETag", stub.etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    stub.url = f"http://127.0.0.1:{httpd.server_address[1]}/feed.xml"
+    yield stub
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture(params=[server, server_mysql], ids=["mongo", "mysql"])
+def aggregator_class(request):
+    return request.param.NewsAggregator
+
+def titles(items):
+    return [item["title"] for item in items]
+
+def test_revalidates_with_etag(feed, aggregator_class):
+    aggregator = aggregator_class([feed.url], ttl=0, max_stale=0, timeout=2)
+
+    async def run():
+        assert titles(await aggregator.get()) == feed.titles
+        assert "If-None-Match" not in feed.requests[0]
+        assert aggregator.validators[feed.url]["etag"] == '"v1"'
+
+        # Unchanged: the 304 keeps the entries from the first fetch
+        assert titles(await aggregator.get()) == ["Gold output up", "New lithium mine"]
+        assert feed.requests[1]["If-None-Match"] == '"v1"'
+        assert aggregator.fetch_feed(feed.url) is None
+
+    asyncio.run(run())
+
+def test_dead_feed_keeps_last_good_entries(feed, aggregator_class):
+    aggregator = aggregator_class([feed.url], ttl=0, max_stale=0, timeout=2)
+
+    async def run():
+        good = await aggregator.get()
+        feed.status = 503
+        assert await aggregator.get() == good
+        assert len(feed.requests) == 2
+
+    asyncio.run(run())
+
+def test_stale_read_returns_cached_items_and_refreshes(feed, aggregator_class):
+    aggregator = aggregator_class([feed.url], ttl=0.05, max_stale=3600, timeout=2)
+
+    async def run():
+        await aggregator.get()
+        feed.etag = '"v2"'
+        feed.titles = ["Platinum exports rise"]
+        feed.delay = 0.5
+        await asyncio.sleep(0.1)
+
+        started = time.monotonic()
+        assert titles(await aggregator.get()) == ["Gold output up", "New lithium mine"]
+        assert time.monotonic() - started < 0.25
+        assert not aggregator.refreshing.done()
+
+        await aggregator.refreshing
+        assert titles(await aggregator.get()) == ["Platinum exports rise"]
+
+    asyncio.run(run())